@@ -3,56 +3,416 @@
 """Searching Algorithms.
 
 This module provides searching functionality.
-    
+
+Graphs can be a Graph, CompactGraph, or FrozenGraph from graphs.py. Vertices are whatever the
+graph's vertices() returns: nodes for the mutable graphs, node indices for a FrozenGraph.
+
 ToDo:
     ~~~~NOW~~~~
-    track depth, other stuff
     ~~~~CONSIDERATION~~~~
     ~~~~PERIODICALLY~~~~
     improve docstrings
     improve modularity (globals, fxns, variables)
     improve naming
     return vs return None vs nothing
-    
+
 """
 
-from graphs import Graph, Node
+from collections import deque
+
+import numpy as np
 
-def breadth_first_search(graph, start):
-    """Traverse a graph using BFS.
+from graphs import Edge, FrozenGraph, Graph, Node
+from sorting import IndexedHeap
+
+def _edge_length(weight):
+    """Get the length of an edge for shortest path searches.
     
     Args:
-        graph (Graph): Graph to traverse. 
-        start (Node): Starting node.
+        weight (int): Edge weight, None if unset.
+    
+    Returns:
+        Weight, 1 if unset.
+    
+    """
+    
+    if weight is None:
+        return 1
+    if weight < 0:
+        raise ValueError("shortest path searches require non-negative edge weights")
+    
+    return weight
+
+def _build_path(parent, end):
+    """Follow parent links back from a vertex.
+    
+    Args:
+        parent (dict): Maps each vertex to the vertex it was reached from (None for the start).
+        end (Node): Last vertex of the path.
+    
+    Returns:
+        list: Vertices from the start to end.
+    
+    """
+    
+    path = [end]
+    while parent[path[-1]] is not None:
+        path.append(parent[path[-1]])
+    
+    return path[::-1]
+
+def breadth_first_search(graph, start, max_depth=None, target=None):
+    """Traverse a graph using BFS. O(V + E).
+    
+    Args:
+        graph (Graph): Graph to traverse.
+        start (Node): Starting vertex.
+        max_depth (int): Don't search past this depth. None for no limit.
+        target (Node): Stop once this vertex is reached. None to search everything.
     
     Returns:
         A dictionary mapping strings to search results.
         
-        {"depth": int,
-         "reachable_nodes": Node list"}
-         
+        {"reachable_nodes": vertex list in visiting order,
+         "depth": dict mapping each visited vertex to its depth,
+         "parent": dict mapping each visited vertex to the vertex it was reached from (None for start),
+         "found": bool, whether target was reached}
+    
     """
     
     # stuff to track
-    visited = []
-    queue = []
-    
-    # by default, start is part of visited and queue
-    visited.append(start)
-    queue.append(start)
+    # depth doubles as the visited set
+    depth = {start: 0}
+    parent = {start: None}
+    visited = [start]
+    queue = deque([start])
     
     # do BFS
-    while(len(queue) > 0):
-        next_node = queue.pop(0)
-        
-        for neighbor in graph.get_edges(next_node):
-            if neighbor not in visited:
-                queue.append(neighbor)
+    while len(queue) > 0 and start != target:
+        next_node = queue.popleft()
+        next_depth = depth[next_node] + 1
         
-        visited.append(next_node)
+        # don't expand past the cutoff
+        if max_depth is not None and next_depth > max_depth:
+            continue
         
+        for neighbor in graph.neighbors(next_node):
+            if neighbor in depth:
+                continue
+            
+            depth[neighbor] = next_depth
+            parent[neighbor] = next_node
+            visited.append(neighbor)
+            queue.append(neighbor)
+            
+            # terminate early
+            if neighbor == target:
+                queue.clear()
+                break
+    
     # print results
-    return {"reachable_nodes": visited}
+    return {"reachable_nodes": visited, "depth": depth, "parent": parent, "found": target in depth}
+
+def iter_bfs(graph, start, neighbor_filter=None):
+    """Lazily traverse a graph using BFS. O(V + E) if fully consumed.
+    
+    Vertices are yielded as they are discovered, so callers can stop at any point without 
+    paying for the rest of the graph. Besides the visited set, only the frontier is stored.
+    
+    Args:
+        graph (Graph): Graph to traverse.
+        start (Node): Starting vertex.
+        neighbor_filter (callable): Called as neighbor_filter(vertex, neighbor), only follows 
+            edges where it returns True. None to follow every edge.
+    
+    Yields:
+        tuple: (vertex, depth) in BFS order, starting with (start, 0).
+    
+    """
+    
+    visited = {start}
+    queue = deque([(start, 0)])
+    yield (start, 0)
+    
+    while len(queue) > 0:
+        (next_node, depth) = queue.popleft()
+        
+        for neighbor in graph.neighbors(next_node):
+            if neighbor in visited or (neighbor_filter is not None and not neighbor_filter(next_node, neighbor)):
+                continue
+            
+            visited.add(neighbor)
+            queue.append((neighbor, depth + 1))
+            yield (neighbor, depth + 1)
+
+def iter_dfs(graph, start, neighbor_filter=None):
+    """Lazily traverse a graph using iterative DFS. O(V + E) if fully consumed.
+    
+    Vertices are yielded in preorder as they are discovered, so callers can stop at any point 
+    without paying for the rest of the graph. Besides the visited set, only the current path's 
+    neighbor iterators are stored, and deep graphs can't hit the recursion limit.
+    
+    Args:
+        graph (Graph): Graph to traverse.
+        start (Node): Starting vertex.
+        neighbor_filter (callable): Called as neighbor_filter(vertex, neighbor), only follows 
+            edges where it returns True. None to follow every edge.
+    
+    Yields:
+        tuple: (vertex, depth) in DFS preorder, starting with (start, 0).
+    
+    """
+    
+    visited = {start}
+    stack = [(start, iter(graph.neighbors(start)))]
+    yield (start, 0)
+    
+    while len(stack) > 0:
+        (next_node, neighbors) = stack[-1]
+        
+        # descend into the first unvisited neighbor, or backtrack
+        for neighbor in neighbors:
+            if neighbor in visited or (neighbor_filter is not None and not neighbor_filter(next_node, neighbor)):
+                continue
+            
+            visited.add(neighbor)
+            yield (neighbor, len(stack))
+            stack.append((neighbor, iter(graph.neighbors(neighbor))))
+            break
+        else:
+            stack.pop()
+
+def dijkstra(graph, source, target=None):
+    """Find shortest weighted paths from a vertex using Dijkstra's algorithm. O((V + E) log V).
+    
+    Unset edge weights count as 1, and negative weights aren't allowed. The frontier is an 
+    IndexedHeap, so each vertex is queued once and its distance lowered in place.
+    
+    Args:
+        graph (Graph): Graph to search.
+        source (Node): Starting vertex.
+        target (Node): Stop once this vertex's distance is final. None to search everything.
+    
+    Returns:
+        A dictionary mapping strings to search results.
+        
+        {"distance": dict mapping each settled vertex to its distance from source,
+         "parent": dict mapping each settled vertex to the vertex before it on its path (None for source)}
+    
+    """
+    
+    distance = dict()
+    parent = {source: None}
+    frontier = IndexedHeap()
+    frontier.push(source, 0)
+    
+    while len(frontier) > 0:
+        (vertex, vertex_distance) = frontier.pop()
+        distance[vertex] = vertex_distance
+        
+        # terminate early
+        if vertex == target:
+            break
+        
+        for (neighbor, weight) in graph.weighted_neighbors(vertex):
+            if neighbor in distance:
+                continue
+            if frontier.update(neighbor, vertex_distance + _edge_length(weight)):
+                parent[neighbor] = vertex
+    
+    # drop parents of vertices that were queued but never settled
+    return {"distance": distance, "parent": {vertex: parent[vertex] for vertex in distance}}
+
+def astar(graph, source, target, heuristic):
+    """Find a shortest weighted path between two vertices using A* search. O((V + E) log V).
+    
+    Unset edge weights count as 1, and negative weights aren't allowed. The heuristic must never 
+    overestimate the remaining distance, and should be consistent (never drop by more than an 
+    edge's length across that edge) so each vertex is settled once.
+    
+    Args:
+        graph (Graph): Graph to search.
+        source (Node): Starting vertex.
+        target (Node): Vertex to reach.
+        heuristic (callable): Called as heuristic(vertex, target), estimates the remaining distance.
+    
+    Returns:
+        A dictionary mapping strings to search results.
+        
+        {"distance": shortest distance, inf if target is unreachable,
+         "path": vertex list from source to target, None if target is unreachable,
+         "explored": int, number of settled vertices}
+    
+    """
+    
+    # distance from source to each queued or settled vertex
+    distance = {source: 0}
+    parent = {source: None}
+    settled = set()
+    frontier = IndexedHeap()
+    frontier.push(source, heuristic(source, target))
+    
+    while len(frontier) > 0:
+        (vertex, _) = frontier.pop()
+        settled.add(vertex)
+        
+        if vertex == target:
+            return {"distance": distance[vertex], "path": _build_path(parent, vertex), "explored": len(settled)}
+        
+        for (neighbor, weight) in graph.weighted_neighbors(vertex):
+            if neighbor in settled:
+                continue
+            
+            neighbor_distance = distance[vertex] + _edge_length(weight)
+            if neighbor not in distance or neighbor_distance < distance[neighbor]:
+                distance[neighbor] = neighbor_distance
+                parent[neighbor] = vertex
+                frontier.update(neighbor, neighbor_distance + heuristic(neighbor, target))
+    
+    return {"distance": float("inf"), "path": None, "explored": len(settled)}
+
+def bidirectional_dijkstra(graph, source, target):
+    """Find a shortest weighted path between two vertices by searching from both ends. O((V + E) log V).
+    
+    Dijkstra's algorithm runs forward from source and backward from target, always advancing the 
+    side with the closer frontier, and stops once the frontiers can't improve on the best path 
+    through a vertex seen by both. This usually settles far fewer vertices than a one-sided search. 
+    Directed graphs are searched backward through weighted_predecessors.
+    
+    Args:
+        graph (Graph): Graph to search.
+        source (Node): Starting vertex.
+        target (Node): Vertex to reach.
+    
+    Returns:
+        A dictionary mapping strings to search results.
+        
+        {"distance": shortest distance, inf if target is unreachable,
+         "path": vertex list from source to target, None if target is unreachable,
+         "explored": int, number of settled vertices on both sides}
+    
+    """
+    
+    # per side: tentative distances, parents, settled vertices, frontier, and edge expansion
+    distances = ({source: 0}, {target: 0})
+    parents = ({source: None}, {target: None})
+    settled = (set(), set())
+    frontiers = (IndexedHeap(), IndexedHeap())
+    expand = (graph.weighted_neighbors, graph.weighted_predecessors)
+    frontiers[0].push(source, 0)
+    frontiers[1].push(target, 0)
+    
+    best_distance, meeting = (0, source) if source == target else (float("inf"), None)
+    while len(frontiers[0]) > 0 and len(frontiers[1]) > 0:
+        # stop once no path through either frontier can be shorter
+        if frontiers[0].peek()[1] + frontiers[1].peek()[1] >= best_distance:
+            break
+        
+        side = 0 if frontiers[0].peek()[1] <= frontiers[1].peek()[1] else 1
+        (vertex, vertex_distance) = frontiers[side].pop()
+        settled[side].add(vertex)
+        
+        for (neighbor, weight) in expand[side](vertex):
+            if neighbor in settled[side]:
+                continue
+            
+            neighbor_distance = vertex_distance + _edge_length(weight)
+            if frontiers[side].update(neighbor, neighbor_distance):
+                distances[side][neighbor] = neighbor_distance
+                parents[side][neighbor] = vertex
+            
+            # connect with the other side's search
+            other_distance = distances[1 - side].get(neighbor)
+            if other_distance is not None and distances[side][neighbor] + other_distance < best_distance:
+                best_distance, meeting = distances[side][neighbor] + other_distance, neighbor
+    
+    explored = len(settled[0]) + len(settled[1])
+    if meeting is None:
+        return {"distance": float("inf"), "path": None, "explored": explored}
+    
+    # join the forward path to meeting with the backward path from meeting
+    path = _build_path(parents[0], meeting) + _build_path(parents[1], meeting)[::-1][1:]
+    
+    return {"distance": best_distance, "path": path, "explored": explored}
+
+def multi_source_bfs(graph, sources):
+    """Find unweighted distances from many vertices at once using bit-parallel BFS. O(S * V + L * E * S / 64).
+    
+    All searches advance one level together, with one bit per search packed into 64-bit words 
+    per vertex. Each level, only the vertices on some search's frontier push their words along 
+    their out edges, gathered from the graph's CSR arrays as NumPy index arrays. The pushed words 
+    are sorted by target and ORed per target, and a mask of the visited words drops searches that 
+    already reached it. A vertex is on the frontier at most once per distinct distance the 
+    searches reach it at, L <= min(S, D) times, and Python only loops once per level instead of 
+    once per vertex and search. Mutable graphs are frozen first; pass a FrozenGraph to reuse one 
+    snapshot across calls.
+    
+    Args:
+        graph (Graph): Graph to search.
+        sources (list): Starting vertices.
+    
+    Returns:
+        A dictionary mapping strings to search results.
+        
+        {"distances": np.ndarray of int32, distances[i, j] is the distance from sources[i] to 
+                      node index j, -1 if unreachable,
+         "node_ids": np.ndarray of int64, id of each node index}
+    
+    """
+    
+    if isinstance(graph, FrozenGraph):
+        frozen, source_indices = graph, np.asarray(sources, dtype=np.int64)
+    else:
+        frozen = graph.freeze()
+        source_indices = np.array([frozen.get_index(source.get_id()) for source in sources], dtype=np.int64)
+    
+    (indptr, indices, _) = frozen.get_arrays()
+    indptr = np.frombuffer(indptr, dtype=np.int64)
+    indices = np.frombuffer(indices, dtype=np.int64)
+    node_count, source_count = frozen.node_count(), len(source_indices)
+    word_count = (source_count + 63) // 64
+    
+    # bit i % 64 of word i // 64 of a vertex's row belongs to search i
+    searches = np.arange(source_count)
+    visited = np.zeros((node_count, word_count), dtype=np.uint64)
+    np.bitwise_or.at(visited, (source_indices, searches // 64), np.left_shift(1, searches % 64).astype(np.uint64))
+    distances = np.full((source_count, node_count), -1, dtype=np.int32)
+    distances[searches, source_indices] = 0
+    
+    # the frontier is kept sparse, as vertex indices and their rows of new search bits
+    active = np.unique(source_indices)
+    frontier = visited[active]
+    
+    level = 0
+    while len(active) > 0:
+        level += 1
+        
+        # expand the active vertices' CSR ranges into edge positions
+        (starts, counts) = (indptr[active], indptr[active + 1] - indptr[active])
+        edge_count = int(counts.sum())
+        if edge_count == 0:
+            break
+        ends = np.cumsum(counts)
+        positions = np.arange(edge_count) + np.repeat(starts - (ends - counts), counts)
+        targets = indices[positions]
+        words = np.repeat(frontier, counts, axis=0)
+        
+        # OR the words pushed to each target, minus searches that already visited it
+        order = np.argsort(targets, kind="stable")
+        targets = targets[order]
+        first = np.flatnonzero(np.r_[True, targets[1:] != targets[:-1]])
+        active = targets[first]
+        frontier = np.bitwise_or.reduceat(words[order], first, axis=0) & ~visited[active]
+        keep = frontier.any(axis=1)
+        (active, frontier) = (active[keep], frontier[keep])
+        visited[active] |= frontier
+        
+        # unpack the new bits into (search, vertex) pairs
+        bits = np.unpackbits(frontier.astype("<u8").view(np.uint8), axis=1, bitorder="little")[:, :source_count]
+        (rows, reached_searches) = np.nonzero(bits)
+        distances[reached_searches, active[rows]] = level
+    
+    return {"distances": distances, "node_ids": np.frombuffer(frozen.get_ids(), dtype=np.int64)}
     
 # test
 if __name__ == "__main__":
@@ -63,10 +423,10 @@ if __name__ == "__main__":
     node3 = Node(20, 3)
     
     my_graph.add_node(node1)
-    my_graph.add_edge((node2, node3))
-    my_graph.add_edge((node3, node1))
+    my_graph.add_edge(Edge(node2, node3))
+    my_graph.add_edge(Edge(node3, node1))
     
     my_graph.print_nodes()
     my_graph.print_edges()
     
-    print breadth_first_search(my_graph, node2)
\ No newline at end of file
+    print(breadth_first_search(my_graph, node2))
@@ -16,17 +16,736 @@ ToDo:
     
 """
 
-def bubble_sort(data):
+import array
+import bisect
+import heapq
+import itertools
+import multiprocessing
+import multiprocessing.shared_memory
+import os
+import pickle
+import tempfile
+
+import numpy as np
+
+# number of elements pickled together when spilling a run to disk
+_SPILL_BATCH_SIZE = 1024
+# slices at most this long are finished with insertion sort
+_INSERTION_SORT_THRESHOLD = 16
+# shortest run natural merge sort builds before merging (it uses fewer on tiny inputs)
+_MIN_RUN = 32
+# consecutive wins from one run before merging switches to galloping
+_MIN_GALLOP = 7
+# bits per radix sort pass (numpy's stable argsort is itself a radix sort for 16-bit keys)
+_RADIX_BITS = 16
+# sort kinds accepted by sort_array
+_ARRAY_SORT_KINDS = ("auto", "counting", "radix", "argsort")
+# inputs shorter than this are sorted in the calling process
+_PARALLEL_MIN_SIZE = 1 << 16
+# samples taken from each sorted chunk to choose the sample sort splitters
+_PARALLEL_OVERSAMPLING = 64
+
+def _merge(source, target, low, middle, high):
+    """Merge the sorted runs source[low:middle] and source[middle:high] into target[low:high]. O(n).
+    
+    Args:
+        source: list holding both sorted runs (list)
+        target: list receiving the merged run (list)
+        low: start of the left run (int)
+        middle: end of the left run and start of the right run (int)
+        high: end of the right run (int)
+    Returns:
+        None
+    """
+    
+    i, j = low, middle
+    for k in range(low, high):
+        # take from the right run only when strictly smaller to stay stable
+        if j < high and (i >= middle or source[j] < source[i]):
+            target[k] = source[j]
+            j += 1
+        else:
+            target[k] = source[i]
+            i += 1
+
+def _insertion_sort_range(data, low, high):
+    """Sort data[low:high] in place using insertion sort. O(n^2).
+    
+    Args:
+        data: data to sort (list)
+        low: start of the range (int)
+        high: end of the range (int)
+    Returns:
+        None
+    """
+    
+    for i in range(low + 1, high):
+        value = data[i]
+        j = i - 1
+        # shift larger values right
+        while j >= low and value < data[j]:
+            data[j + 1] = data[j]
+            j -= 1
+        data[j + 1] = value
+
+def _sift_down(data, low, root, end):
+    """Restore the max-heap rooted at data[low + root], with the heap spanning data[low:low + end]. O(log n).
+    
+    Args:
+        data: data holding the heap (list)
+        low: offset of the heap within data (int)
+        root: heap position to sift down (int)
+        end: heap size (int)
+    Returns:
+        None
+    """
+    
+    value = data[low + root]
+    child = 2 * root + 1
+    while child < end:
+        # pick the larger child
+        if child + 1 < end and data[low + child] < data[low + child + 1]:
+            child += 1
+        if not value < data[low + child]:
+            break
+        data[low + root] = data[low + child]
+        root = child
+        child = 2 * root + 1
+    data[low + root] = value
+
+def _heap_sort_range(data, low, high):
+    """Sort data[low:high] in place using heap sort. O(n log n).
+    
+    Args:
+        data: data to sort (list)
+        low: start of the range (int)
+        high: end of the range (int)
+    Returns:
+        None
+    """
+    
+    n = high - low
+    
+    # build max-heap
+    for root in range(n // 2 - 1, -1, -1):
+        _sift_down(data, low, root, n)
+    
+    # repeatedly move the max behind the shrinking heap
+    for end in range(n - 1, 0, -1):
+        data[low], data[low + end] = data[low + end], data[low]
+        _sift_down(data, low, 0, end)
+
+def _median_of_three(data, low, high):
+    """Choose a pivot as the median of the first, middle, and last values of data[low:high]. O(1).
+    
+    Args:
+        data: data to partition (list)
+        low: start of the range (int)
+        high: end of the range (int)
+    Returns:
+        pivot value
+    """
+    
+    a, b, c = data[low], data[(low + high - 1) // 2], data[high - 1]
+    if a < b:
+        if b < c:
+            return b
+        return c if a < c else a
+    if a < c:
+        return a
+    return c if b < c else b
+
+def _partition3(data, low, high, pivot):
+    """Partition data[low:high] in place into smaller, equal, and larger sections. O(n).
+    
+    Uses Dutch national flag partitioning so duplicates of the pivot are kept together.
+    
+    Args:
+        data: data to partition (list)
+        low: start of the range (int)
+        high: end of the range (int)
+        pivot: value to partition around
+    Returns:
+        bounds (lt, gt) so data[low:lt] < pivot, data[lt:gt] == pivot, data[gt:high] > pivot (tuple)
+    """
+    
+    lt, i, gt = low, low, high
+    while i < gt:
+        value = data[i]
+        if value < pivot:
+            data[lt], data[i] = value, data[lt]
+            lt += 1
+            i += 1
+        elif pivot < value:
+            gt -= 1
+            data[gt], data[i] = value, data[gt]
+        else:
+            i += 1
+    
+    return lt, gt
+
+def _introsort(data, low, high, depth_limit):
+    """Sort data[low:high] in place using introsort. O(n log n).
+    
+    Args:
+        data: data to sort (list)
+        low: start of the range (int)
+        high: end of the range (int)
+        depth_limit: partitioning depth left before switching to heap sort (int)
+    Returns:
+        None
+    """
+    
+    while high - low > _INSERTION_SORT_THRESHOLD:
+        # avoid quadratic behavior on adversarial input
+        if depth_limit == 0:
+            _heap_sort_range(data, low, high)
+            return
+        depth_limit -= 1
+        
+        lt, gt = _partition3(data, low, high, _median_of_three(data, low, high))
+        
+        # recurse into the smaller side and loop on the larger side to bound the stack
+        if lt - low < high - gt:
+            _introsort(data, low, lt, depth_limit)
+            low = gt
+        else:
+            _introsort(data, gt, high, depth_limit)
+            high = lt
+    
+    _insertion_sort_range(data, low, high)
+
+def _radix_keys(arr):
+    """Map a 1-D array to unsigned integer keys with the same stable sort order. O(n).
+    
+    Floats and datetimes are mapped so NaN and NaT sort last, matching np.sort.
+    
+    Args:
+        arr: data to map (np.ndarray of bool, int, float, datetime64, or timedelta64)
+    Returns:
+        keys (np.ndarray of unsigned int) or None if the dtype has no integer mapping
+    """
+    
+    kind = arr.dtype.kind
+    
+    if kind == "b":
+        return arr.view(np.uint8)
+    if kind == "u":
+        return arr
+    if kind == "i":
+        unsigned = np.dtype(f"u{arr.dtype.itemsize}")
+        # flip the sign bit so negatives sort before positives
+        return arr.view(unsigned) ^ unsigned.type(1 << (8 * arr.dtype.itemsize - 1))
+    if kind == "f":
+        unsigned = np.dtype(f"u{arr.dtype.itemsize}")
+        sign = unsigned.type(1 << (8 * arr.dtype.itemsize - 1))
+        # adding zero turns -0.0 into 0.0 so both compare equal
+        bits = (arr + arr.dtype.type(0)).view(unsigned)
+        # negatives reverse all bits, positives only set the sign bit
+        keys = np.where(bits & sign, ~bits, bits | sign)
+        keys[np.isnan(arr)] = np.iinfo(unsigned).max
+        return keys
+    if kind in "mM":
+        keys = _radix_keys(arr.view(np.int64))
+        keys[np.isnat(arr)] = np.iinfo(np.uint64).max
+        return keys
+    
+    return None
+
+def _key_span(arr):
+    """Find the span of an array's radix keys from its extremes, without mapping every value. O(n).
+    
+    Args:
+        arr: data to check (np.ndarray)
+    Returns:
+        largest minus smallest key (int) or None if the dtype has no integer mapping or the 
+        array holds NaN or NaT
+    """
+    
+    if arr.dtype.kind not in "buifmM":
+        return None
+    
+    # min and max propagate NaN and NaT, which map to the largest key
+    extremes = np.array([arr.min(), arr.max()], dtype=arr.dtype)
+    if (arr.dtype.kind == "f" and np.isnan(extremes).any()) or (arr.dtype.kind in "mM" and np.isnat(extremes).any()):
+        return None
+    keys = _radix_keys(extremes)
+    
+    return int(keys[1]) - int(keys[0])
+
+def _radix_argsort(keys):
+    """Find the stable sorting permutation of unsigned integer keys using LSD radix sort. O(n * w).
+    
+    Args:
+        keys: keys to sort (np.ndarray of unsigned int)
+    Returns:
+        permutation indices (np.ndarray of int)
+    """
+    
+    low = keys.min()
+    span = int(keys.max() - low)
+    # widen so every digit mask fits the key dtype
+    shifted = (keys - low).astype(np.promote_types(keys.dtype, np.uint16))
+    
+    order = np.arange(len(keys))
+    # only visit digits that vary across the keys
+    for shift in range(0, span.bit_length(), _RADIX_BITS):
+        digits = ((shifted[order] >> shifted.dtype.type(shift)) & 0xFFFF).astype(np.uint16)
+        order = order[np.argsort(digits, kind="stable")]
+    
+    return order
+
+def _counting_argsort(keys):
+    """Find the stable sorting permutation of unsigned integer keys spanning at most 2^16 values. O(n).
+    
+    Args:
+        keys: keys to sort (np.ndarray of unsigned int)
+    Returns:
+        permutation indices (np.ndarray of int)
+    """
+    
+    # one counting pass over the offsets from the smallest key
+    return np.argsort((keys - keys.min()).astype(np.uint16), kind="stable")
+
+def _bytes_argsort(arr):
+    """Find the stable sorting permutation of fixed-width byte strings using LSD radix sort. O(n * w).
+    
+    Args:
+        arr: data to sort (np.ndarray of bytes)
+    Returns:
+        permutation indices (np.ndarray of int)
+    """
+    
+    width = arr.dtype.itemsize
+    columns = np.ascontiguousarray(arr).view(np.uint8).reshape(len(arr), width).astype(np.uint16)
+    
+    order = np.arange(len(arr))
+    # sort by 2-byte digits, least significant (rightmost) first
+    for start in range(width - width % 2, -1, -2):
+        if start == width:
+            continue
+        digits = columns[order, start] << 8
+        if start + 1 < width:
+            digits |= columns[order, start + 1]
+        order = order[np.argsort(digits, kind="stable")]
+    
+    return order
+
+def _attach_array(name, dtype, size):
+    """Attach to a 1-D array stored in shared memory.
+    
+    Args:
+        name: shared memory block name (str)
+        dtype: array dtype (str)
+        size: number of elements (int)
+    Returns:
+        shared memory block and the array viewing it (tuple)
+    """
+    
+    block = multiprocessing.shared_memory.SharedMemory(name=name)
+    
+    return block, np.ndarray((size,), dtype=dtype, buffer=block.buf)
+
+def _sort_chunk(name, dtype, size, low, high):
+    """Sort one chunk of a shared array in place (worker).
+    
+    Args:
+        name: shared memory block name (str)
+        dtype: array dtype (str)
+        size: number of elements in the shared array (int)
+        low: start of the chunk (int)
+        high: end of the chunk (int)
+    Returns:
+        None
+    """
+    
+    block, data = _attach_array(name, dtype, size)
+    try:
+        data[low:high].sort()
+    finally:
+        del data
+        block.close()
+
+def _merge_bucket(source_name, target_name, dtype, size, segments, offset):
+    """Gather one bucket's segments from every sorted chunk into the output and sort it (worker).
+    
+    Args:
+        source_name: shared memory block name of the sorted chunks (str)
+        target_name: shared memory block name of the output (str)
+        dtype: array dtype (str)
+        size: number of elements in each shared array (int)
+        segments: (start, end) range of the bucket within each chunk (list of tuple)
+        offset: start of the bucket in the output (int)
+    Returns:
+        None
+    """
+    
+    source_block, source = _attach_array(source_name, dtype, size)
+    target_block, target = _attach_array(target_name, dtype, size)
+    try:
+        position = offset
+        for start, end in segments:
+            target[position:position + end - start] = source[start:end]
+            position += end - start
+        
+        # the bucket is a concatenation of sorted runs, which a stable (run-aware) sort merges quickly
+        target[offset:position].sort(kind="stable")
+    finally:
+        del source, target
+        source_block.close()
+        target_block.close()
+
+def _binary_insertion_sort_range(data, low, start, high):
+    """Sort data[low:high] in place using binary insertion sort, given data[low:start] is sorted. O(n^2).
+    
+    Finding each insertion point takes O(log n) comparisons; only shifting is linear.
+    
+    Args:
+        data: data to sort (list)
+        low: start of the range (int)
+        start: end of the sorted prefix (int)
+        high: end of the range (int)
+    Returns:
+        None
+    """
+    
+    for i in range(start, high):
+        value = data[i]
+        # insert after equal values to stay stable
+        position = bisect.bisect_right(data, value, low, i)
+        data[position + 1:i + 1] = data[position:i]
+        data[position] = value
+
+def _run_end(data, low, high):
+    """Find the end of the natural run starting at data[low]. O(n).
+    
+    Args:
+        data: data to scan (list)
+        low: start of the run (int)
+        high: end of the data to scan (int)
+    Returns:
+        end of the run and whether it is strictly descending (tuple)
+    """
+    
+    end = low + 1
+    if end == high:
+        return end, False
+    
+    # descending runs must be strict so reversing them keeps the sort stable
+    if data[end] < data[end - 1]:
+        while end < high and data[end] < data[end - 1]:
+            end += 1
+        return end, True
+    
+    while end < high and not data[end] < data[end - 1]:
+        end += 1
+    
+    return end, False
+
+def _count_run(data, low, high):
+    """Find the natural run starting at data[low], reversing it in place if it is descending. O(n).
+    
+    Args:
+        data: data to scan (list)
+        low: start of the run (int)
+        high: end of the data to scan (int)
+    Returns:
+        end of the run (int)
+    """
+    
+    end, is_descending = _run_end(data, low, high)
+    if is_descending:
+        data[low:end] = data[low:end][::-1]
+    
+    return end
+
+def _count_natural_runs(data):
+    """Count the maximal ascending or strictly descending runs in data. O(n).
+    
+    Args:
+        data: data to scan (list)
+    Returns:
+        number of runs (int)
+    """
+    
+    n = len(data)
+    runs = 0
+    low = 0
+    while low < n:
+        low, _ = _run_end(data, low, n)
+        runs += 1
+    
+    return runs
+
+def _min_run(n):
+    """Choose the minimum run length so the number of runs is a power of two or slightly less. O(log n).
+    
+    Args:
+        n: data length (int)
+    Returns:
+        minimum run length (int)
+    """
+    
+    remainder = 0
+    while n >= 2 * _MIN_RUN:
+        remainder |= n & 1
+        n >>= 1
+    
+    return n + remainder
+
+def _gallop_merge(data, low, middle, high):
+    """Merge the adjacent sorted runs data[low:middle] and data[middle:high] in place using galloping. O(n).
+    
+    Once one run wins several comparisons in a row, the rest of its winning stretch is found with 
+    a binary search and copied as one slice.
+    
+    Args:
+        data: data holding both runs (list)
+        low: start of the left run (int)
+        middle: end of the left run and start of the right run (int)
+        high: end of the right run (int)
+    Returns:
+        None
+    """
+    
+    # skip values already in their final place at either end
+    low = bisect.bisect_right(data, data[middle], low, middle)
+    if low == middle:
+        return
+    high = bisect.bisect_left(data, data[middle - 1], middle, high)
+    
+    left = data[low:middle]
+    left_len = len(left)
+    i, j, k = 0, middle, low
+    left_wins = right_wins = 0
+    while i < left_len and j < high:
+        # take from the right run only when strictly smaller to stay stable
+        if data[j] < left[i]:
+            data[k] = data[j]
+            j += 1
+            k += 1
+            left_wins, right_wins = 0, right_wins + 1
+            if right_wins >= _MIN_GALLOP:
+                end = bisect.bisect_left(data, left[i], j, high)
+                data[k:k + end - j] = data[j:end]
+                k, j, right_wins = k + end - j, end, 0
+        else:
+            data[k] = left[i]
+            i += 1
+            k += 1
+            left_wins, right_wins = left_wins + 1, 0
+            if left_wins >= _MIN_GALLOP and j < high:
+                end = bisect.bisect_right(left, data[j], i, left_len)
+                data[k:k + end - i] = left[i:end]
+                k, i, left_wins = k + end - i, end, 0
+    
+    # the rest of the right run is already in place
+    data[k:k + left_len - i] = left[i:]
+
+def _merge_at(data, runs, index):
+    """Merge the runs at index and index + 1 of the run stack. O(n).
+    
+    Args:
+        data: data holding the runs (list)
+        runs: stack of (start, length) runs (list)
+        index: position of the left run in the stack (int)
+    Returns:
+        None
+    """
+    
+    (start, length), (next_start, next_length) = runs[index], runs[index + 1]
+    _gallop_merge(data, start, next_start, next_start + next_length)
+    runs[index:index + 2] = [(start, length + next_length)]
+
+def _merge_collapse(data, runs):
+    """Merge runs on the stack until Timsort's run length invariants hold. O(n).
+    
+    Args:
+        data: data holding the runs (list)
+        runs: stack of (start, length) runs (list)
+    Returns:
+        None
+    """
+    
+    while len(runs) > 1:
+        n = len(runs) - 2
+        if ((n > 0 and runs[n - 1][1] <= runs[n][1] + runs[n + 1][1]) or 
+                (n > 1 and runs[n - 2][1] <= runs[n - 1][1] + runs[n][1])):
+            if runs[n - 1][1] < runs[n + 1][1]:
+                n -= 1
+        elif runs[n][1] > runs[n + 1][1]:
+            break
+        _merge_at(data, runs, n)
+
+def _copy_sequence(data):
+    """Make a shallow copy of a sequence. O(n).
+    
+    Args:
+        data: data to copy (list, array.array, or np.ndarray)
+    Returns:
+        copy of the same type
+    """
+    
+    # slicing an ndarray only makes a view
+    return data.copy() if isinstance(data, np.ndarray) else data[:]
+
+def _introselect(data, low, high, k, depth_limit):
+    """Partition data[low:high] in place so data[k] holds the value it would have if sorted. O(n).
+    
+    Args:
+        data: data to partition (list or array.array)
+        low: start of the range (int)
+        high: end of the range (int)
+        k: index to select (int)
+        depth_limit: partitioning depth left before switching to heap sort (int)
+    Returns:
+        None
+    """
+    
+    while high - low > _INSERTION_SORT_THRESHOLD:
+        # avoid quadratic behavior on adversarial input
+        if depth_limit == 0:
+            _heap_sort_range(data, low, high)
+            return
+        depth_limit -= 1
+        
+        lt, gt = _partition3(data, low, high, _median_of_three(data, low, high))
+        
+        # only keep partitioning the side holding k
+        if k < lt:
+            high = lt
+        elif k >= gt:
+            low = gt
+        else:
+            return
+    
+    _insertion_sort_range(data, low, high)
+
+def _sort_by_key(sort_function, data, key, **kwargs):
+    """Sort data by a key kept in a parallel list, then undecorate through an index permutation. O(n log n) extra.
+    
+    The key function runs exactly once per element, and sort_function sorts a list of the keys 
+    alone, so neither elements nor (key, index) tuples are ever compared. Each element is then 
+    matched to its key's sorted position by binary search, with equal keys taking consecutive 
+    slots in their original order, which builds the permutation as an array of indices and 
+    keeps ties stable.
+    
+    Args:
+        sort_function: sort function from this module (callable)
+        data: data to sort (list or array.array)
+        key: function computing the sort key of an element (callable)
+        kwargs: extra arguments for sort_function
+    Returns:
+        sorted list, or data itself sorted in place if sort_function sorts in place
+    """
+    
+    n = len(data)
+    keys = [key(value) for value in data]
+    work = keys[:]
+    sorted_keys = sort_function(work, **kwargs)
+    
+    # slot of each element, counting the equal keys already placed after the first
+    order = array.array("q", [-1]) * n
+    placed = array.array("q", bytes(8 * n))
+    for i, value in enumerate(keys):
+        first = bisect.bisect_left(sorted_keys, value)
+        slot = first + placed[first] if first < n else n
+        if slot >= n or order[slot] != -1:
+            # keys without a consistent order (such as NaN) can't be matched back to slots
+            order = array.array("q", sorted(range(n), key=keys.__getitem__))
+            break
+        placed[first] += 1
+        order[slot] = i
+    
+    undecorated = [data[i] for i in order]
+    
+    # write back for in-place sorts
+    if sorted_keys is work:
+        for i, value in enumerate(undecorated):
+            data[i] = value
+        return data
+    
+    return undecorated
+
+def _pad_rows(rows):
+    """Pack ragged rows into a 2-D array, padding each row on the right. O(n).
+    
+    Padding is NaN for floats and the dtype's max otherwise, so a stable sort keeps it after the 
+    row's own values.
+    
+    Args:
+        rows: rows of numbers (sequence of sequences)
+    Returns:
+        padded rows (np.ndarray)
+    """
+    
+    lengths = np.array([len(row) for row in rows])
+    # skip empty rows so they cannot change the dtype
+    values = [np.asarray(row) for row in rows if len(row) > 0]
+    values = np.concatenate(values) if len(values) > 0 else np.array([])
+    
+    if values.dtype.kind == "f":
+        pad = np.nan
+    elif values.dtype.kind in "iu":
+        pad = np.iinfo(values.dtype).max
+    else:
+        raise TypeError(f"cannot pad rows of dtype {values.dtype}")
+    
+    width = lengths.max() if len(rows) > 0 else 0
+    padded = np.full((len(rows), width), pad, dtype=values.dtype)
+    padded[np.arange(width) < lengths[:, None]] = values
+    
+    return padded
+
+def _spill_run(run, temp_dir=None):
+    """Write a sorted run to a temporary file.
+    
+    Args:
+        run: sorted data (list)
+        temp_dir: directory for the temporary file (str or None)
+    Returns:
+        temporary file positioned at its start (file object)
+    """
+    
+    file = tempfile.TemporaryFile(dir=temp_dir)
+    # pickle in batches to amortize per-call overhead
+    for i in range(0, len(run), _SPILL_BATCH_SIZE):
+        pickle.dump(run[i:i + _SPILL_BATCH_SIZE], file, pickle.HIGHEST_PROTOCOL)
+    file.seek(0)
+    
+    return file
+
+def _read_run(file):
+    """Stream a sorted run back from a temporary file.
+    
+    Args:
+        file: temporary file written by _spill_run (file object)
+    Returns:
+        generator of run elements
+    """
+    
+    while True:
+        try:
+            batch = pickle.load(file)
+        except EOFError:
+            return
+        yield from batch
+
+def bubble_sort(data, key=None):
     """Sort a list of unique numbers in ascending order using bubble sort. O(n^2).
     
     The process includes repeatedly iterating through a list and swapping adjacent elements. 
     
     Args:
         data: data to sort (list of int)
+        key: function computing the sort key of an element, called once per element (callable or None)
     Returns:
         sorted list
     """
     
+    if key is not None:
+        return _sort_by_key(bubble_sort, data, key)
+    
     n = len(data)
     sorted_data = data[:]
     is_ordered = True
@@ -48,50 +767,48 @@ def bubble_sort(data):
     
     return sorted_data
 
-def quick_sort(data):
-    """Sort a list of unique numbers in ascending order using quick sort. O(n^2).
+def quick_sort(data, key=None):
+    """Sort a list of numbers in place in ascending order using introsort. O(n log n).
     
-    The process includes recursively splitting a list into a pivot, smaller side, and larger side.
+    The process includes partitioning around a median-of-three pivot into smaller, equal, and 
+    larger sections. Small sections are finished with insertion sort, and heap sort takes over 
+    when partitioning recurses too deeply. Extra memory is O(log n).
     
     Args:
         data: data to sort (list of int)
+        key: function computing the sort key of an element, called once per element (callable or None)
     Returns:
-        sorted list
+        the sorted list (same object as data)
     """
     
+    if key is not None:
+        return _sort_by_key(quick_sort, data, key)
+    
     n = len(data)
     
     # terminate early
     if n < 2:
         return data
     
-    pivot = data[0]
-
-    # organize data around pivot
-    left = [value for i, value in enumerate(data[1:]) if value < pivot]
-    right = [value for i, value in enumerate(data[1:]) if value > pivot]
-    # make recursive calls
-    sorted_left = quick_sort(left)
-    sorted_right = quick_sort(right)
-        
-    # combine sorted data with pivot
-    sorted_data = sorted_left
-    sorted_data.append(pivot)
-    sorted_data.extend(sorted_right)
+    _introsort(data, 0, n, 2 * n.bit_length())
     
-    return sorted_data
+    return data
 
-def insert_sort(data):
+def insert_sort(data, key=None):
     """Sort a list of unique numbers in ascending order using insert sort. O(n^2).
     
     The process includes iterating through a list and ordering elements as they're visited.
     
     Args:
         data: data to sort (list of int)
+        key: function computing the sort key of an element, called once per element (callable or None)
     Returns:
         sorted list
     """
     
+    if key is not None:
+        return _sort_by_key(insert_sort, data, key)
+    
     sorted_data = data[:]
     
     # visit new elements
@@ -105,85 +822,672 @@ def insert_sort(data):
     
     return sorted_data
 
-def selection_sort(data):
+def selection_sort(data, key=None):
     """Sort a list of unique numbers in ascending order using selection sort. O(n^2).
     
     The process includes repeatedly iterating through a list, finding the smallest element, and sorting that element.
     
     Args:
         data: data to sort (list of int)
+        key: function computing the sort key of an element, called once per element (callable or None)
     Returns:
         sorted list
     """
+    
+    if key is not None:
+        return _sort_by_key(selection_sort, data, key)
 
     sorted_data = data[:]
     
     for i, value in enumerate(sorted_data):
         # find smallest value in unsorted subset
         min_value = min(sorted_data[i:])
-        index_min = sorted_data.index(min_value)
+        index_min = sorted_data.index(min_value, i)
         
         # place smallest value at start of unsorted subset
         sorted_data[i], sorted_data[index_min] = min_value, value
 
     return sorted_data
 
-def merge_sort(data):
-    """Sort a list of unique numbers in ascending order using merge sort. .
+def merge_sort(data, key=None):
+    """Sort a list of numbers in ascending order using bottom-up merge sort. O(n log n).
     
-    The process includes recursively splitting a list to a smaller and larger side.
+    The process includes merging adjacent sorted runs of doubling width. Merges walk indices 
+    instead of popping from lists, and alternate between the copy and one reusable buffer.
     
     Args:
         data: data to sort (list of int)
+        key: function computing the sort key of an element, called once per element (callable or None)
     Returns:
         sorted list
     """
     
-    # split
-    data_len = len(data)
+    if key is not None:
+        return _sort_by_key(merge_sort, data, key)
+    
+    n = len(data)
+    source = data[:]
     
     # terminate early
-    if data_len == 1:
-        return data
-
-    # split
-    left = data[:data_len // 2]
-    right = data[data_len // 2:]
+    if n < 2:
+        return source
+    
+    target = [None] * n
+    width = 1
+    while width < n:
+        # merge each pair of adjacent runs from source into target
+        for low in range(0, n, 2 * width):
+            middle = min(low + width, n)
+            high = min(low + 2 * width, n)
+            _merge(source, target, low, middle, high)
+        
+        # the merged runs become the source of the next pass
+        source, target = target, source
+        width *= 2
+    
+    return source
 
-    # make recursive calls
-    sorted_left = merge_sort(left)
-    sorted_right = merge_sort(right)
+def external_sort(source, key=None, chunk_size=100000, temp_dir=None):
+    """Sort data that may not fit in memory using an external k-way merge. O(n log n).
     
-    # combine
-    sorted_data = []
-    while True:
-        smaller = None
-        if len(sorted_left) != 0 and len(sorted_right) != 0:
-            smaller = sorted_left.pop(0) if sorted_left[0] < sorted_right[0] else sorted_right.pop(0)
-        elif len(sorted_left) != 0:
-            smaller = sorted_left.pop(0)
-        elif len(sorted_right) != 0:
-            smaller = sorted_right.pop(0)
-        else:
-            break
-            
-        sorted_data.append(smaller)
+    The process includes sorting chunks that fit in memory, spilling each sorted chunk to a 
+    temporary file, and lazily merging the spilled runs with a heap.
     
-    return sorted_data
+    Args:
+        source: file path whose lines to sort (str or PathLike), or data to sort (iterable)
+        key: function computing the sort key of an element (callable or None)
+        chunk_size: max number of elements held in memory per run (int)
+        temp_dir: directory for the temporary run files (str or None)
+    Returns:
+        generator of sorted elements (lines are yielded without their newline)
+    """
+    
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    
+    # read lines from a path, otherwise consume the iterable directly
+    if isinstance(source, (str, os.PathLike)):
+        with open(source) as file:
+            yield from external_sort((line.rstrip("\n") for line in file), key=key, 
+                                     chunk_size=chunk_size, temp_dir=temp_dir)
+        return
     
-def heap_sort(data):
-    """Sort a list of unique numbers in ascending order using heap sort. .
+    runs = []
+    try:
+        iterator = iter(source)
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if len(chunk) == 0:
+                break
+            # runs fit in memory, so use the builtin sort for each one
+            chunk.sort(key=key)
+            
+            # terminate early if all data fit in a single run
+            if len(runs) == 0 and len(chunk) < chunk_size:
+                yield from chunk
+                return
+            
+            runs.append(_spill_run(chunk, temp_dir))
+        
+        yield from heapq.merge(*(_read_run(run) for run in runs), key=key)
+    finally:
+        for run in runs:
+            run.close()
     
-    N/A
+def natural_merge_sort(data, stats=None, key=None):
+    """Sort a list of numbers in ascending order using a run-detecting natural merge sort. O(n log n).
+    
+    The process includes finding existing ascending and strictly descending runs, extending short 
+    runs with binary insertion sort, and merging runs with galloping, as in Timsort. Nearly-sorted 
+    data forms few runs, so it sorts in close to O(n).
     
     Args:
         data: data to sort (list of int)
+        stats: filled with "runs", the number of natural runs in data, and "presortedness", 
+            from 1.0 for a single run down to 0.0 when every run has 2 elements (dict or None)
+        key: function computing the sort key of an element, called once per element (callable or None)
     Returns:
         sorted list
     """
     
-    pass
+    if key is not None:
+        return _sort_by_key(natural_merge_sort, data, key, stats=stats)
+    
+    n = len(data)
+    sorted_data = data[:]
+    min_run = _min_run(n)
+    
+    # measure presortedness before short runs get merged away
+    if stats is not None:
+        natural_runs = _count_natural_runs(data)
+        # a run has at least 2 elements, except possibly the last one
+        max_runs = (n + 1) // 2
+        stats["runs"] = natural_runs
+        stats["presortedness"] = 1.0 if max_runs < 2 else 1.0 - (natural_runs - 1) / (max_runs - 1)
+    
+    runs = []
+    low = 0
+    while low < n:
+        end = _count_run(sorted_data, low, n)
+        
+        # extend short runs to the minimum run length
+        if end - low < min_run:
+            forced_end = min(low + min_run, n)
+            _binary_insertion_sort_range(sorted_data, low, end, forced_end)
+            end = forced_end
+        
+        runs.append((low, end - low))
+        _merge_collapse(sorted_data, runs)
+        low = end
+    
+    # merge whatever is left on the stack
+    while len(runs) > 1:
+        index = len(runs) - 2
+        if index > 0 and runs[index - 1][1] < runs[index + 1][1]:
+            index -= 1
+        _merge_at(sorted_data, runs, index)
+    
+    return sorted_data
+
+def heap_sort(data, key=None):
+    """Sort a list of numbers in place in ascending order using heap sort. O(n log n).
+    
+    The process includes building a max-heap inside the list, then repeatedly swapping the max 
+    behind the heap and sifting the new root down. Extra memory is O(1).
+    
+    Args:
+        data: data to sort (list of int or array.array)
+        key: function computing the sort key of an element, called once per element (callable or None)
+    Returns:
+        the sorted data (same object as data)
+    """
+    
+    if key is not None:
+        return _sort_by_key(heap_sort, data, key)
+    
+    _heap_sort_range(data, 0, len(data))
+    
+    return data
+
+def select_kth(data, k, copy=False):
+    """Find the k-th smallest value (0-based) using introselect. Expected O(n).
+    
+    The process includes repeatedly partitioning around a median-of-three pivot and only keeping 
+    the side holding k, with heap sort taking over when partitioning recurses too deeply. The data 
+    is left partitioned around index k.
+    
+    Args:
+        data: data to search (list, array.array, or np.ndarray)
+        k: rank of the value to find (int)
+        copy: partition a copy instead of data itself (bool)
+    Returns:
+        k-th smallest value
+    """
+    
+    n = len(data)
+    if not 0 <= k < n:
+        raise IndexError("k is out of range")
+    
+    work = _copy_sequence(data) if copy else data
+    if isinstance(work, np.ndarray):
+        work.partition(k)
+    else:
+        _introselect(work, 0, n, k, 2 * n.bit_length())
+    
+    return work[k]
+
+def nsmallest_k(data, k, copy=False):
+    """Find the k smallest values in ascending order. Expected O(n + k log k).
+    
+    Sequences are partitioned using introselect and only the selected values are sorted. Any other 
+    iterable, such as an iterator over unbounded input, is consumed with a bounded heap that never 
+    holds more than k values.
+    
+    Args:
+        data: data to search (list, array.array, np.ndarray, or iterable)
+        k: number of values to find (int)
+        copy: partition a copy instead of data itself (bool)
+    Returns:
+        k smallest values (list)
+    """
+    
+    if not isinstance(data, (list, array.array, np.ndarray)):
+        return heapq.nsmallest(k, data)
+    
+    n = len(data)
+    
+    # terminate early
+    if k <= 0:
+        return []
+    if k >= n:
+        return sorted(data)
+    
+    work = _copy_sequence(data) if copy else data
+    select_kth(work, k - 1)
+    
+    return quick_sort(list(work[:k]))
+
+def nlargest_k(data, k, copy=False):
+    """Find the k largest values in descending order. Expected O(n + k log k).
+    
+    Sequences are partitioned using introselect and only the selected values are sorted. Any other 
+    iterable, such as an iterator over unbounded input, is consumed with a bounded heap that never 
+    holds more than k values.
+    
+    Args:
+        data: data to search (list, array.array, np.ndarray, or iterable)
+        k: number of values to find (int)
+        copy: partition a copy instead of data itself (bool)
+    Returns:
+        k largest values (list)
+    """
+    
+    if not isinstance(data, (list, array.array, np.ndarray)):
+        return heapq.nlargest(k, data)
+    
+    n = len(data)
+    
+    # terminate early
+    if k <= 0:
+        return []
+    if k >= n:
+        return sorted(data, reverse=True)
+    
+    work = _copy_sequence(data) if copy else data
+    select_kth(work, n - k)
+    
+    return quick_sort(list(work[n - k:]))[::-1]
+
+def sort_array(arr, kind="auto"):
+    """Sort a 1-D NumPy array in ascending order using vectorized counting or radix sort. O(n * w).
+    
+    The process includes mapping the values to unsigned integer keys and sorting the keys with 
+    stable 16-bit passes, so the result is always stable. The permutation is also returned so 
+    companion columns can be reordered with it. "auto" checks the key span from the array's 
+    minimum and maximum first, and only maps the keys for a counting sort when they span at most 
+    2^16 values; wider keys go to np.argsort, which beats the 16-bit radix passes.
+    
+    Args:
+        arr: data to sort (np.ndarray of bool, int, float, datetime64, timedelta64, or bytes)
+        kind: "counting", "radix", "argsort" (np.argsort), or "auto" to choose by dtype and key range (str)
+    Returns:
+        sorted copy and permutation indices, so sorted copy == arr[indices] (tuple of np.ndarray)
+    """
+    
+    arr = np.asarray(arr)
+    
+    if kind not in _ARRAY_SORT_KINDS:
+        raise ValueError(f"kind must be one of {_ARRAY_SORT_KINDS}")
+    if arr.ndim != 1:
+        raise ValueError("arr must be 1-D")
+    
+    # terminate early
+    if len(arr) < 2:
+        order = np.arange(len(arr))
+        return arr[order], order
+    
+    if kind == "argsort":
+        order = np.argsort(arr, kind="stable")
+    elif kind == "auto" and arr.dtype.kind != "S":
+        span = _key_span(arr)
+        if span is not None and span <= 0xFFFF:
+            order = _counting_argsort(_radix_keys(arr))
+        else:
+            order = np.argsort(arr, kind="stable")
+    elif arr.dtype.kind == "S":
+        order = _bytes_argsort(arr) if kind != "counting" else None
+    else:
+        keys = _radix_keys(arr)
+        if keys is None:
+            order = None
+        else:
+            span = int(keys.max() - keys.min())
+            if kind == "counting" and span > 0xFFFF:
+                raise ValueError("counting sort requires keys spanning at most 2^16 values")
+            order = _counting_argsort(keys) if kind == "counting" else _radix_argsort(keys)
+    
+    if order is None:
+        raise TypeError(f"{kind} sort does not support dtype {arr.dtype}")
+    
+    return arr[order], order
+
+def sort_rows(matrix):
+    """Sort every row of a 2-D array in ascending order at once. O(n log w).
+    
+    The process includes one stable np.argsort along the rows, so the per-row loop runs in C 
+    instead of calling a sort function per row. Ragged rows are padded on the right with NaN 
+    (floats) or the dtype's max (ints), which stays after each row's own values.
+    
+    Args:
+        matrix: rows of numbers (2-D np.ndarray, or sequence of sequences possibly of different lengths)
+    Returns:
+        sorted (padded) copy and per-row permutation indices, so sorted copy == 
+        np.take_along_axis(padded matrix, indices, axis=1) (tuple of np.ndarray)
+    """
+    
+    if isinstance(matrix, np.ndarray):
+        if matrix.ndim != 2:
+            raise ValueError("matrix must be 2-D")
+    else:
+        widths = {len(row) for row in matrix}
+        matrix = np.array(matrix) if len(widths) <= 1 else _pad_rows(matrix)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(len(matrix), 0)
+    
+    indices = np.argsort(matrix, axis=1, kind="stable")
+    
+    return np.take_along_axis(matrix, indices, axis=1), indices
+
+def parallel_sort(data, workers=None):
+    """Sort a 1-D numeric array in ascending order using a parallel sample sort. O(n log n / p).
+    
+    The process includes copying the data into shared memory, sorting one chunk per worker, 
+    choosing splitters from samples of the sorted chunks, and letting each worker gather and sort 
+    the values between two splitters into its slice of a shared output. Workers only receive 
+    shared memory names and bounds, so the data itself is never pickled.
+    
+    Args:
+        data: data to sort (np.ndarray or sequence of numbers)
+        workers: number of worker processes, defaults to the CPU count (int or None)
+    Returns:
+        sorted copy (np.ndarray)
+    """
+    
+    arr = np.asarray(data)
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    
+    if arr.ndim != 1:
+        raise ValueError("data must be 1-D")
+    if arr.dtype.hasobject:
+        raise TypeError("parallel sort requires a numeric dtype")
+    if workers < 1:
+        raise ValueError("workers must be positive")
+    
+    # terminate early when process overhead would dominate
+    n = len(arr)
+    if workers == 1 or n < _PARALLEL_MIN_SIZE:
+        return np.sort(arr)
+    
+    dtype = arr.dtype.str
+    bounds = [n * i // workers for i in range(workers + 1)]
+    source_block = multiprocessing.shared_memory.SharedMemory(create=True, size=arr.nbytes)
+    target_block = multiprocessing.shared_memory.SharedMemory(create=True, size=arr.nbytes)
+    try:
+        source = np.ndarray((n,), dtype=arr.dtype, buffer=source_block.buf)
+        source[:] = arr
+        
+        with multiprocessing.Pool(workers) as pool:
+            # sort the chunks independently
+            pool.starmap(_sort_chunk, [(source_block.name, dtype, n, bounds[i], bounds[i + 1])
+                                       for i in range(workers)])
+            
+            # choose splitters from evenly spaced samples of every sorted chunk
+            samples = np.sort(np.concatenate([
+                source[np.linspace(bounds[i], bounds[i + 1] - 1, _PARALLEL_OVERSAMPLING).astype(np.intp)]
+                for i in range(workers)]))
+            splitters = samples[np.arange(1, workers) * len(samples) // workers]
+            
+            # locate each bucket within each chunk
+            cuts = [np.concatenate(([bounds[i]], 
+                                    bounds[i] + np.searchsorted(source[bounds[i]:bounds[i + 1]], splitters, side="right"), 
+                                    [bounds[i + 1]]))
+                    for i in range(workers)]
+            segments = [[(int(cuts[i][b]), int(cuts[i][b + 1])) for i in range(workers)] for b in range(workers)]
+            offsets = np.cumsum([0] + [sum(end - start for start, end in bucket) for bucket in segments])
+            
+            # gather and sort the buckets independently
+            pool.starmap(_merge_bucket, [(source_block.name, target_block.name, dtype, n, segments[b], int(offsets[b]))
+                                         for b in range(workers)])
+        
+        target = np.ndarray((n,), dtype=arr.dtype, buffer=target_block.buf)
+        sorted_data = target.copy()
+        del source, target
+    finally:
+        for block in (source_block, target_block):
+            block.close()
+            block.unlink()
+    
+    return sorted_data
+
+class KeyCache:
+    """Memoizing wrapper for an expensive key function.
+    
+    Pass an instance as key= to reuse keys across repeated sorts of the same elements. Keys are 
+    cached by element identity, and the cache holds a reference to each element so identities are 
+    never reused. Call invalidate after mutating an element in a way that changes its key.
+    """
+    
+    def __init__(self, key):
+        """Make an empty cache. O(1).
+        
+        Args:
+            key: function computing the sort key of an element (callable)
+        Returns:
+            None
+        """
+        
+        self._key = key
+        self._keys = {}
+    
+    def __len__(self):
+        return len(self._keys)
+    
+    def __call__(self, value):
+        """Get an element's key, computing it on the first call only. O(1) when cached.
+        
+        Args:
+            value: element to get the key of
+        Returns:
+            key of the element
+        """
+        
+        entry = self._keys.get(id(value))
+        if entry is None:
+            entry = self._keys[id(value)] = (value, self._key(value))
+        
+        return entry[1]
+    
+    def invalidate(self, value=None):
+        """Forget one element's key, or every key. O(1) or O(n).
+        
+        Args:
+            value: element whose key to forget, or None to clear the cache
+        Returns:
+            None
+        """
+        
+        if value is None:
+            self._keys.clear()
+        else:
+            self._keys.pop(id(value), None)
+
+class IndexedHeap:
+    """Min-priority queue with O(log n) push, pop, and decrease-key.
+    
+    Each item's heap position is indexed by the item itself, so priorities can be lowered in place 
+    instead of pushing duplicate, stale entries as with heapq. Items must be hashable and unique; 
+    only priorities are compared.
+    """
+    
+    def __init__(self):
+        """Make an empty heap. O(1).
+        
+        Args:
+            N/A
+        Returns:
+            None
+        """
+        
+        self._items = []
+        self._priorities = []
+        self._positions = {}
+    
+    def __len__(self):
+        return len(self._items)
+    
+    def __contains__(self, item):
+        return item in self._positions
+    
+    def push(self, item, priority):
+        """Add an item. O(log n).
+        
+        Args:
+            item: item to add (hashable)
+            priority: priority of the item
+        Returns:
+            None
+        """
+        
+        if item in self._positions:
+            raise ValueError("item is already in the heap")
+        
+        self._items.append(item)
+        self._priorities.append(priority)
+        self._positions[item] = len(self._items) - 1
+        self._sift_up(len(self._items) - 1)
+    
+    def pop(self):
+        """Remove the item with the smallest priority. O(log n).
+        
+        Args:
+            N/A
+        Returns:
+            item and its priority (tuple)
+        """
+        
+        if len(self._items) == 0:
+            raise IndexError("pop from empty heap")
+        
+        item, priority = self._items[0], self._priorities[0]
+        
+        # move the last entry to the root and restore the heap
+        last_item, last_priority = self._items.pop(), self._priorities.pop()
+        del self._positions[item]
+        if len(self._items) > 0:
+            self._items[0], self._priorities[0] = last_item, last_priority
+            self._positions[last_item] = 0
+            self._sift_down(0)
+        
+        return item, priority
+    
+    def peek(self):
+        """Get the item with the smallest priority without removing it. O(1).
+        
+        Args:
+            N/A
+        Returns:
+            item and its priority (tuple)
+        """
+        
+        if len(self._items) == 0:
+            raise IndexError("peek from empty heap")
+        
+        return self._items[0], self._priorities[0]
+    
+    def priority(self, item):
+        """Get an item's priority. O(1).
+        
+        Args:
+            item: item in the heap (hashable)
+        Returns:
+            priority of the item
+        """
+        
+        return self._priorities[self._positions[item]]
+    
+    def decrease_key(self, item, priority):
+        """Lower an item's priority. O(log n).
+        
+        Args:
+            item: item in the heap (hashable)
+            priority: new priority, no larger than the current one
+        Returns:
+            None
+        """
+        
+        position = self._positions[item]
+        if self._priorities[position] < priority:
+            raise ValueError("new priority is larger than the current priority")
+        
+        self._priorities[position] = priority
+        self._sift_up(position)
+    
+    def update(self, item, priority):
+        """Add an item, or lower its priority if it is already present and the new one is smaller. O(log n).
+        
+        Args:
+            item: item to add or update (hashable)
+            priority: candidate priority
+        Returns:
+            True if the heap changed. False if otherwise. (bool)
+        """
+        
+        if item not in self._positions:
+            self.push(item, priority)
+            return True
+        if priority < self._priorities[self._positions[item]]:
+            self.decrease_key(item, priority)
+            return True
+        
+        return False
+    
+    def _move(self, item, priority, position):
+        """Place an entry at a heap position. O(1).
+        
+        Args:
+            item: item to place (hashable)
+            priority: priority of the item
+            position: target heap position (int)
+        Returns:
+            None
+        """
+        
+        self._items[position], self._priorities[position] = item, priority
+        self._positions[item] = position
+    
+    def _sift_up(self, position):
+        """Move an entry towards the root until its parent is no larger. O(log n).
+        
+        Args:
+            position: heap position of the entry (int)
+        Returns:
+            None
+        """
+        
+        item, priority = self._items[position], self._priorities[position]
+        while position > 0:
+            parent = (position - 1) // 2
+            if not priority < self._priorities[parent]:
+                break
+            self._move(self._items[parent], self._priorities[parent], position)
+            position = parent
+        self._move(item, priority, position)
+    
+    def _sift_down(self, position):
+        """Move an entry towards the leaves until its children are no smaller. O(log n).
+        
+        Args:
+            position: heap position of the entry (int)
+        Returns:
+            None
+        """
+        
+        n = len(self._items)
+        item, priority = self._items[position], self._priorities[position]
+        child = 2 * position + 1
+        while child < n:
+            # pick the smaller child
+            if child + 1 < n and self._priorities[child + 1] < self._priorities[child]:
+                child += 1
+            if not self._priorities[child] < priority:
+                break
+            self._move(self._items[child], self._priorities[child], position)
+            position = child
+            child = 2 * position + 1
+        self._move(item, priority, position)
     
-a = [1, -1, 8, -8, 240]
-b = [1, 2]
-print(insert_sort(a))
+# test
+if __name__ == "__main__":
+    a = [1, -1, 8, -8, 240]
+    b = [1, 2]
+    print(insert_sort(a))
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+
+"""Sorting benchmarks.
+
+This module times the functions in sorting.py over different input sizes and shapes, and records
+their allocation peaks using tracemalloc. Results can be saved as a JSON baseline and later runs
+compared against it, failing when throughput regresses past a threshold.
+
+Arguments:
+    --sizes: input sizes to benchmark (default: 10 to 10^7 in decades)
+    --distributions: input shapes to benchmark (default: all)
+    --functions: sort functions to benchmark (default: all)
+    --repeat: timed runs per case, the best is kept (default: 3)
+    --baseline: JSON baseline to compare against
+    --save: JSON file to write the results to
+    --threshold: allowed throughput regression in percent (default: 10)
+
+ToDo:
+    ~~~~NOW~~~~
+    ~~~~CONSIDERATION~~~~
+    ~~~~PERIODICALLY~~~~
+"""
+
+#~~~~  IMPORTS  ~~~~#
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import sorting
+
+#~~~~  PRIVATE GLOBAL VARIABLES  ~~~~#
+# largest input given to the O(n^2) sorts
+_QUADRATIC_MAX_SIZE = 10 ** 4
+# sorts that take a NumPy array instead of a list
+_ARRAY_FUNCTIONS = ("sort_array", "parallel_sort")
+# seed shared by all generators so runs are comparable
+_SEED = 0
+# sorted runs external_sort spills per input, so every size exercises the k-way merge
+_EXTERNAL_SORT_RUNS = 8
+
+#~~~~  PUBLIC GLOBAL VARIABLES  ~~~~#
+SIZES = tuple(10 ** i for i in range(1, 8))
+DISTRIBUTIONS = ("random", "sorted", "reversed", "few_unique", "sawtooth", "nearly_sorted")
+SORT_FUNCTIONS = {
+    "bubble_sort": sorting.bubble_sort,
+    "insert_sort": sorting.insert_sort,
+    "selection_sort": sorting.selection_sort,
+    "merge_sort": sorting.merge_sort,
+    "quick_sort": sorting.quick_sort,
+    "heap_sort": sorting.heap_sort,
+    "natural_merge_sort": sorting.natural_merge_sort,
+    "external_sort": lambda data: list(sorting.external_sort(data, chunk_size=max(1, len(data) // _EXTERNAL_SORT_RUNS))),
+    "sort_array": sorting.sort_array,
+    "parallel_sort": sorting.parallel_sort,
+}
+QUADRATIC_FUNCTIONS = ("bubble_sort", "insert_sort", "selection_sort")
+
+#~~~~  PRIVATE CLASSES  ~~~~#
+
+#~~~~  PUBLIC CLASSES  ~~~~#
+
+#~~~~  PRIVATE FUNCTIONS  ~~~~#
+def _case_name(function, distribution, size):
+    """Format the name of a benchmark case.
+
+    Args:
+        function: sort function name (str)
+        distribution: input shape (str)
+        size: input size (int)
+    Returns:
+        case name (str)
+    """
+
+    return f"{function}/{distribution}/{size}"
+
+#~~~~  PUBLIC FUNCTIONS  ~~~~#
+def generate_data(distribution, size, seed=_SEED):
+    """Generate benchmark input.
+
+    Args:
+        distribution: one of DISTRIBUTIONS (str)
+        size: number of values (int)
+        seed: random seed (int)
+    Returns:
+        data (list of int)
+    """
+
+    rng = random.Random(seed)
+
+    if distribution == "random":
+        return [rng.randrange(size * 10) for _ in range(size)]
+    if distribution == "sorted":
+        return list(range(size))
+    if distribution == "reversed":
+        return list(range(size, 0, -1))
+    if distribution == "few_unique":
+        return [rng.randrange(8) for _ in range(size)]
+    if distribution == "sawtooth":
+        tooth = max(1, int(size ** 0.5))
+        return [i % tooth for i in range(size)]
+    if distribution == "nearly_sorted":
+        # ~1% of the values arrive out of place
+        data = list(range(size))
+        for _ in range(max(1, size // 100)):
+            i, j = rng.randrange(size), rng.randrange(size)
+            data[i], data[j] = data[j], data[i]
+        return data
+
+    raise ValueError(f"unknown distribution: {distribution}")
+
+def benchmark(function, data, repeat=3):
+    """Time a sort function and measure its allocation peak.
+
+    Every run sorts a fresh copy, so in-place sorts see the same input each time.
+
+    Args:
+        function: sort function taking the data (callable)
+        data: input data (list or np.ndarray)
+        repeat: timed runs, the best is kept (int)
+    Returns:
+        "seconds", "throughput" (values per second), and "peak_bytes" of the case (dict)
+    """
+
+    best = float("inf")
+    for _ in range(repeat):
+        work = data.copy()
+        start = time.perf_counter()
+        function(work)
+        best = min(best, time.perf_counter() - start)
+
+    # trace separately since tracing slows every allocation down
+    work = data.copy()
+    tracemalloc.start()
+    try:
+        function(work)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": best, "throughput": len(data) / best if best > 0 else float("inf"), "peak_bytes": peak}
+
+def run_suite(functions=tuple(SORT_FUNCTIONS), distributions=DISTRIBUTIONS, sizes=SIZES, repeat=3, log=print):
+    """Benchmark every combination of sort function, input shape, and size.
+
+    The O(n^2) sorts skip sizes above _QUADRATIC_MAX_SIZE, and parallel_sort skips sizes below 
+    sorting._PARALLEL_MIN_SIZE, where it falls back to np.sort.
+
+    Args:
+        functions: sort function names from SORT_FUNCTIONS (iterable of str)
+        distributions: input shapes from DISTRIBUTIONS (iterable of str)
+        sizes: input sizes (iterable of int)
+        repeat: timed runs per case (int)
+        log: called with a line per finished case (callable or None)
+    Returns:
+        results by case name (dict)
+    """
+
+    results = {}
+    for distribution in distributions:
+        for size in sizes:
+            data = generate_data(distribution, size)
+            array_data = np.array(data)
+            for function in functions:
+                if function in QUADRATIC_FUNCTIONS and size > _QUADRATIC_MAX_SIZE:
+                    continue
+                if function == "parallel_sort" and size < sorting._PARALLEL_MIN_SIZE:
+                    continue
+
+                name = _case_name(function, distribution, size)
+                results[name] = benchmark(SORT_FUNCTIONS[function],
+                                          array_data if function in _ARRAY_FUNCTIONS else data, repeat)
+                if log is not None:
+                    log(f"{name}: {results[name]['seconds']:.6f} s, {results[name]['throughput']:.0f} values/s, "
+                        f"{results[name]['peak_bytes']} B peak")
+
+    return results
+
+def find_regressions(results, baseline, threshold=10.0):
+    """Compare results against a baseline.
+
+    Cases missing from either side are ignored.
+
+    Args:
+        results: results by case name, from run_suite (dict)
+        baseline: results by case name, from a previous run (dict)
+        threshold: allowed throughput drop in percent (float)
+    Returns:
+        case name, baseline throughput, and current throughput of each regression (list of tuple)
+    """
+
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        expected = baseline[name]["throughput"]
+        if result["throughput"] < expected * (1 - threshold / 100):
+            regressions.append((name, expected, result["throughput"]))
+
+    return regressions
+
+#~~~~  MAIN  ~~~~#
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the functions in sorting.py.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--distributions", nargs="+", choices=DISTRIBUTIONS, default=DISTRIBUTIONS)
+    parser.add_argument("--functions", nargs="+", choices=tuple(SORT_FUNCTIONS), default=tuple(SORT_FUNCTIONS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline")
+    parser.add_argument("--save")
+    parser.add_argument("--threshold", type=float, default=10.0)
+    args = parser.parse_args()
+
+    results = run_suite(args.functions, args.distributions, args.sizes, args.repeat)
+
+    if args.save is not None:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=4, sort_keys=True)
+
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+        regressions = find_regressions(results, baseline, args.threshold)
+        for name, expected, actual in regressions:
+            print(f"REGRESSION {name}: {actual:.0f} values/s vs {expected:.0f} values/s baseline")
+        if len(regressions) > 0:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
+
+#~~~~  DEAD CODE  ~~~~#
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+"""Tests for searching.py.
+
+Run from this directory with graphs.py on the path:
+    PYTHONPATH="../Custom Libraries" python -m unittest test_searching
+
+"""
+
+from array import array
+import random
+import unittest
+
+import numpy as np
+
+from graphs import Edge, FrozenGraph, Graph, Node
+from searching import breadth_first_search, multi_source_bfs
+
+def _chain(node_count):
+    """Make a directed path 0 -> 1 -> ... -> node_count - 1.
+    
+    Args:
+        node_count (int): Number of nodes.
+    
+    Returns:
+        FrozenGraph: Chain, with node ids equal to node indices.
+    
+    """
+    
+    indptr = array("q", range(node_count))
+    indptr.append(node_count - 1)
+    
+    return FrozenGraph(array("q", range(node_count)), indptr, array("q", range(1, node_count)), None, True)
+
+class MultiSourceBFSTest(unittest.TestCase):
+
+    def assert_matches_bfs(self, frozen, sources):
+        distances = multi_source_bfs(frozen, sources)["distances"]
+        for (row, source) in enumerate(sources):
+            expected = np.full(frozen.node_count(), -1)
+            for (vertex, depth) in breadth_first_search(frozen, source)["depth"].items():
+                expected[vertex] = depth
+            np.testing.assert_array_equal(distances[row], expected)
+    
+    def test_random_graphs(self):
+        rng = random.Random(5)
+        for _ in range(40):
+            graph = Graph(param_directed = rng.random() < 0.5)
+            node_count = rng.randrange(1, 60)
+            for node_id in range(node_count):
+                graph.add_node(Node(node_id))
+            for _ in range(rng.randrange(3 * node_count)):
+                graph.add_edge(Edge(Node(rng.randrange(node_count)), Node(rng.randrange(node_count))))
+            
+            # more than 64 sources, with repeats, spills into a second word
+            sources = [rng.randrange(node_count) for _ in range(rng.randrange(140))]
+            self.assert_matches_bfs(graph.freeze(), sources)
+    
+    def test_high_diameter(self):
+        # every level has one frontier vertex, so each level must only touch its edges
+        frozen = _chain(20000)
+        distances = multi_source_bfs(frozen, list(range(64)))["distances"]
+        np.testing.assert_array_equal(distances[63, 63:], np.arange(20000 - 63))
+        np.testing.assert_array_equal(distances[63, :63], -1)
+        self.assert_matches_bfs(_chain(2000), [0, 5, 1999])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,11 +8,14 @@ Classes:
     Node
     Edge
     Graph
+    NodeView
+    EdgeView
+    CompactGraph
+    FrozenGraph
     
 Functions:
     
 Todo:
-    Mess with special functions (e.g. hash, etc)
     improve consistency (e.g. naming, etc)
     Document time complexities
     Improve size/efficiency
@@ -21,395 +24,2791 @@ Todo:
     
 """
 
-from copy import deepcopy
-# ^ when to use that?
-# check if need special function, and time complexity
+from array import array
+from collections import deque
+from itertools import islice
+from math import isnan
+import mmap
+import os
+import struct
+import sys
+import threading
+
+# only needed for the vectorized bulk loaders, which fall back to plain Python without it
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    # one record of a binary edge list
+    _EDGE_RECORD_DTYPE = np.dtype([("start", "<i8"), ("end", "<i8"), ("weight", "<f8")])
+
+# edges per chunk when reading edge list files
+_EDGE_LIST_CHUNK_SIZE = 1 << 20
+# bytes per (int64 start id, int64 end id, float64 weight) record in binary edge lists
+_EDGE_RECORD_SIZE = 24
+# saved graph header: magic, format version, flags, node count, edge count
+_GRAPH_FILE_HEADER = struct.Struct("<8sIIqq")
+_GRAPH_FILE_MAGIC = b"GRAPHCSR"
+_GRAPH_FILE_VERSION = 1
+_GRAPH_FILE_DIRECTED = 1
+_GRAPH_FILE_WEIGHTED = 2
+# 2^64 / golden ratio, for scattering hashes over _ChunkedDict chunks
+_FIBONACCI_MULTIPLIER = 0x9E3779B97F4A7C15
+# edges a CompactGraph node needs before it gets a dict from neighbor to edge
+_COMPACT_INDEX_DEGREE = 32
+
+def _to_column_weight(param_weight):
+    """Convert an edge weight for storage in a float column. O(1).
+    
+    Args:
+        param_weight (int): Edge weight, or None.
+    
+    Returns:
+        float: Weight, NaN if None.
+    
+    """
+    
+    return float("nan") if param_weight is None else param_weight
+
+def _optional_weights(param_weights):
+    """Drop a weight column when no weight is set. O(E).
+    
+    Args:
+        param_weights (array): Edge weights, NaN if unset.
+    
+    Returns:
+        array: param_weights. None if every weight is unset.
+    
+    """
+    
+    return param_weights if any(not isnan(weight) for weight in param_weights) else None
+
+def _read_edge_list(param_path, param_format = "csv", param_chunk_size = _EDGE_LIST_CHUNK_SIZE):
+    """Read an edge list file in chunks of columns. O(E).
+    
+    CSV files hold a start id, end id, and optional weight per line. Binary files hold packed 
+    little-endian (int64 start id, int64 end id, float64 weight) records with NaN for unset 
+    weights. They are memory mapped, and each column is copied out of a strided view in one go 
+    instead of unpacking records one at a time.
+    
+    Args:
+        param_path (str): Path of the file.
+        param_format (str): "csv" or "bin".
+        param_chunk_size (int): Edges per chunk.
+    
+    Returns:
+        generator: (start ids, end ids, weights) arrays per chunk, weights NaN if unset.
+    
+    """
+    
+    if param_format == "csv":
+        with open(param_path) as file:
+            while True:
+                lines = list(islice(file, param_chunk_size))
+                if len(lines) == 0:
+                    return
+                
+                (starts, ends, weights) = (array("q"), array("q"), array("d"))
+                for line in lines:
+                    fields = line.split(",")
+                    # skip blank lines
+                    if len(fields) < 2:
+                        if line.strip() != "":
+                            raise ValueError("edge list line needs a start and end id: {!r}".format(line))
+                        continue
+                    starts.append(int(fields[0]))
+                    ends.append(int(fields[1]))
+                    weights.append(float(fields[2]) if len(fields) > 2 and fields[2].strip() != "" else float("nan"))
+                yield (starts, ends, weights)
+    
+    elif param_format == "bin":
+        with open(param_path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size % _EDGE_RECORD_SIZE != 0:
+                raise ValueError("binary edge list size isn't a multiple of {} bytes".format(_EDGE_RECORD_SIZE))
+            # empty files can't be mapped
+            if size == 0:
+                return
+            
+            count = size // _EDGE_RECORD_SIZE
+            with mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ) as mapped, \
+                 memoryview(mapped) as view, view.cast("q") as words, view.cast("d") as floats:
+                for first in range(0, count, param_chunk_size):
+                    last = min(first + param_chunk_size, count)
+                    columns = (array("q", words[3 * first:3 * last:3].tobytes()), 
+                               array("q", words[3 * first + 1:3 * last:3].tobytes()), 
+                               array("d", floats[3 * first + 2:3 * last:3].tobytes()))
+                    if sys.byteorder == "big":
+                        for column in columns:
+                            column.byteswap()
+                    yield columns
+    
+    else:
+        raise ValueError("unknown edge list format: {}".format(param_format))
+
+def _frozen_edge_columns(param_frozen, param_chunk_size = _EDGE_LIST_CHUNK_SIZE):
+    """Read a FrozenGraph's edges back out as id columns in chunks. O(V + E).
+    
+    Args:
+        param_frozen (FrozenGraph): Graph to read.
+        param_chunk_size (int): Edges per chunk, with NumPy.
+    
+    Returns:
+        generator: (start ids, end ids, weights) per chunk, weights NaN if unset.
+    
+    """
+    
+    (ids, (indptr, indices, weights)) = (param_frozen.get_ids(), param_frozen.get_arrays())
+    
+    if np is None:
+        for index in range(len(ids)):
+            (first, last) = (indptr[index], indptr[index + 1])
+            yield (array("q", [ids[index]]) * (last - first), array("q", (ids[neighbor] for neighbor in indices[first:last])), 
+                   array("d", [float("nan")]) * (last - first) if weights is None else weights[first:last])
+        return
+    
+    ids = np.frombuffer(ids, dtype=np.int64)
+    starts = np.repeat(ids, np.diff(np.frombuffer(indptr, dtype=np.int64)))
+    ends = ids[np.frombuffer(indices, dtype=np.int64)]
+    weights = np.full(len(ends), np.nan) if weights is None else np.frombuffer(weights, dtype=np.float64)
+    # lists of Python numbers, so zip hands out ints and floats rather than NumPy scalars
+    for first in range(0, len(ends), param_chunk_size):
+        last = first + param_chunk_size
+        yield (starts[first:last].tolist(), ends[first:last].tolist(), weights[first:last].tolist())
+
+def _dedupe_rows(param_indptr, param_indices, param_weights):
+    """Keep only the first edge from each node to each neighbor in CSR arrays, sorting each row. O(E log E).
+    
+    Args:
+        param_indptr (array): Offsets of each node's neighbors in param_indices.
+        param_indices (array): Neighbor node indices.
+        param_weights (array): Edge weights matching param_indices.
+    
+    Returns:
+        tuple: indptr, indices, and weights without repeated neighbors, in ascending neighbor order.
+    
+    """
+    
+    (indptr, indices, weights) = (array("q", [0]), array("q"), array("d"))
+    for i in range(len(param_indptr) - 1):
+        (first, last) = (param_indptr[i], param_indptr[i + 1])
+        # neighbor -> weight, filled back to front so the first edge's weight is the one kept
+        row = dict(zip(reversed(param_indices[first:last]), reversed(param_weights[first:last])))
+        neighbors = sorted(row)
+        indices.extend(neighbors)
+        weights.extend(map(row.__getitem__, neighbors))
+        indptr.append(len(indices))
+    
+    return (indptr, indices, weights)
+
+def _edge_list_csr(param_starts, param_ends, param_weights, param_directed):
+    """Build CSR arrays from edge id columns with NumPy. O(E log E), vectorized.
+    
+    Nodes are numbered in ascending id order and each node's neighbors are listed in ascending 
+    index order. As with Graph.add_edge, only the first edge from one node to another is kept, 
+    which only needs a position-tracking argsort when edges are weighted; unweighted edges are 
+    deduped by sorting their packed (start, end) keys alone.
+    
+    Args:
+        param_starts (np.ndarray): Start id of each edge.
+        param_ends (np.ndarray): End id of each edge.
+        param_weights (np.ndarray): Weight of each edge, NaN if unset.
+        param_directed (bool): Is graph directed.
+    
+    Returns:
+        tuple: ids, indptr, indices, and weights arrays, weights None if no edge is weighted.
+    
+    """
+    
+    (starts, ends, weights) = (param_starts, param_ends, param_weights)
+    
+    # number the ids, through a lookup table when they are dense enough
+    if len(starts) == 0:
+        ids = np.empty(0, dtype=np.int64)
+    else:
+        # Python ints, since the span of 64-bit ids can overflow int64
+        (low, high) = (int(min(starts.min(), ends.min())), int(max(starts.max(), ends.max())))
+        if high - low < 8 * len(starts):
+            present = np.zeros(high - low + 1, dtype=bool)
+            present[starts - low] = True
+            present[ends - low] = True
+            ids = np.flatnonzero(present) + low
+            # ids without gaps only need shifting
+            if len(ids) == len(present):
+                (starts, ends) = (starts - low, ends - low)
+            else:
+                table = np.cumsum(present) - 1
+                (starts, ends) = (table[starts - low], table[ends - low])
+            del present
+        else:
+            (ids, inverse) = np.unique(np.concatenate((starts, ends)), return_inverse=True)
+            (starts, ends) = (inverse[:len(starts)], inverse[len(starts):])
+    
+    # list undirected edges from both ends, each right after the other, so the first of 
+    # repeated edges wins on both sides
+    if not param_directed:
+        (both_starts, both_ends) = (np.empty(2 * len(starts), dtype=np.int64), np.empty(2 * len(starts), dtype=np.int64))
+        (both_starts[0::2], both_starts[1::2]) = (starts, ends)
+        (both_ends[0::2], both_ends[1::2]) = (ends, starts)
+        (starts, ends) = (both_starts, both_ends)
+        weights = np.repeat(weights, 2)
+    
+    node_count = len(ids)
+    keys = starts * node_count
+    keys += ends
+    del starts, ends
+    sorted_keys = np.sort(keys)
+    first = np.ones(len(keys), dtype=bool)
+    first[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    if np.isnan(weights).all():
+        (keys, weights) = (sorted_keys[first], None)
+    else:
+        # a stable argsort keeps the first of repeated edges, but is only needed if there are any
+        order = np.argsort(keys, kind="quicksort" if first.all() else "stable")
+        (keys, weights) = (sorted_keys[first], weights[order[first]])
+        del order
+    del sorted_keys, first
+    
+    starts = keys // max(node_count, 1)
+    keys -= starts * node_count
+    indptr = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(starts, minlength=node_count), out=indptr[1:])
+    
+    return (array("q", ids.astype(np.int64).tobytes()), array("q", indptr.tobytes()), array("q", keys.tobytes()), 
+            None if weights is None or np.isnan(weights).all() else array("d", weights.tobytes()))
+
+# stack marker for finishing a vertex in _find_cycle
+_FINISHED = object()
+
+def _find_cycle(param_graph):
+    """Find a cycle using iterative white/grey/black DFS. O(V + E).
+    
+    Neighbors are pushed onto an explicit stack instead of keeping one iterator per path vertex, 
+    followed by a marker that finishes the vertex once they have all been explored.
+    
+    Args:
+        param_graph (Graph): Graph with the traversal methods (vertices, neighbors, is_directed).
+    
+    Returns:
+        list: Cycle's vertices in path order. None if acyclic.
+    
+    """
+    
+    directed = param_graph.is_directed()
+    # vertex -> True while on the DFS path (grey), False once finished (black), absent if unvisited (white)
+    on_path = dict()
+    # vertex -> vertex it was entered from
+    parents = dict()
+    
+    for root in param_graph.vertices():
+        if root in on_path:
+            continue
+        
+        # (vertex to enter, vertex it was pushed from) or (_FINISHED, vertex to finish)
+        stack = [(root, None)]
+        while len(stack) > 0:
+            (vertex, parent) = stack.pop()
+            if vertex is _FINISHED:
+                on_path[parent] = False
+                continue
+            # already entered through another edge
+            if vertex in on_path:
+                continue
+            
+            on_path[vertex] = True
+            parents[vertex] = parent
+            stack.append((_FINISHED, vertex))
+            for neighbor in param_graph.neighbors(vertex):
+                state = on_path.get(neighbor)
+                if state is None:
+                    stack.append((neighbor, vertex))
+                # found a back edge to a vertex on the path, other than an undirected tree edge
+                elif state is True and (directed or neighbor != parent):
+                    cycle = [vertex]
+                    while cycle[-1] != neighbor:
+                        cycle.append(parents[cycle[-1]])
+                    return cycle[::-1]
+    
+    return None
+
+def _topological_order(param_graph):
+    """Order a directed graph's vertices using Kahn's algorithm. O(V + E).
+    
+    Args:
+        param_graph (Graph): Graph with the traversal methods (vertices, neighbors, is_directed).
+    
+    Returns:
+        dict: {"order": vertex list, None if cyclic, 
+               "cycle": vertex list witnessing why no order exists, None if acyclic}
+    
+    """
+    
+    if not param_graph.is_directed():
+        raise ValueError("topological order requires a directed graph")
+    
+    in_degrees = {vertex: 0 for vertex in param_graph.vertices()}
+    for vertex in in_degrees:
+        for neighbor in param_graph.neighbors(vertex):
+            in_degrees[neighbor] += 1
+    
+    # repeatedly remove vertices without remaining incoming edges
+    ready = deque(vertex for (vertex, in_degree) in in_degrees.items() if in_degree == 0)
+    order = list()
+    while len(ready) > 0:
+        vertex = ready.popleft()
+        order.append(vertex)
+        for neighbor in param_graph.neighbors(vertex):
+            in_degrees[neighbor] -= 1
+            if in_degrees[neighbor] == 0:
+                ready.append(neighbor)
+    
+    # leftover vertices are on or behind a cycle
+    if len(order) < len(in_degrees):
+        return {"order": None, "cycle": _find_cycle(param_graph)}
+    
+    return {"order": order, "cycle": None}
+
+class _UnionFind:
+    """Disjoint sets of node ids, with path compression and union by rank.
+    
+    """
+    
+    __slots__ = ("_parents", "_ranks", "_count")
+    
+    def __init__(self):
+        """Make an empty forest. O(1).
+        
+        """
+        
+        # node id -> parent node id, roots are their own parent
+        self._parents = dict()
+        # root node id -> upper bound on its tree's height
+        self._ranks = dict()
+        self._count = 0
+    
+    def add(self, param_id):
+        """Add a singleton set. O(1).
+        
+        Args:
+            param_id (int): Node id to add.
+        
+        """
+        
+        if param_id not in self._parents:
+            self._parents[param_id] = param_id
+            self._ranks[param_id] = 0
+            self._count += 1
+    
+    def find(self, param_id):
+        """Find the root of a node id's set. O(α(V)) amortized.
+        
+        Args:
+            param_id (int): Node id in the forest.
+        
+        Returns:
+            int: Root node id.
+        
+        """
+        
+        parents = self._parents
+        root = param_id
+        while parents[root] != root:
+            root = parents[root]
+        
+        # point the whole path at the root
+        while parents[param_id] != root:
+            (parents[param_id], param_id) = (root, parents[param_id])
+        
+        return root
+    
+    def union(self, param_a, param_b):
+        """Merge the sets of two node ids. O(α(V)) amortized.
+        
+        Args:
+            param_a (int): Node id in the forest.
+            param_b (int): Node id in the forest.
+        
+        Returns:
+            bool: True if merged. False if already in the same set.
+        
+        """
+        
+        (root_a, root_b) = (self.find(param_a), self.find(param_b))
+        if root_a == root_b:
+            return False
+        
+        # hang the shorter tree under the taller one
+        if self._ranks[root_a] < self._ranks[root_b]:
+            (root_a, root_b) = (root_b, root_a)
+        self._parents[root_b] = root_a
+        if self._ranks[root_a] == self._ranks[root_b]:
+            self._ranks[root_a] += 1
+        del self._ranks[root_b]
+        self._count -= 1
+        
+        return True
+    
+    def count(self):
+        """Get the number of sets. O(1).
+        
+        """
+        
+        return self._count
+
+def _strongly_connected_components(param_graph):
+    """Number a graph's strongly connected components using iterative Tarjan. O(V + E).
+    
+    Components are numbered in reverse topological order, so every edge leads to a component 
+    numbered no higher than its start's.
+    
+    Args:
+        param_graph (Graph): Graph with the traversal methods (vertices, neighbors).
+    
+    Returns:
+        tuple: dict mapping each vertex to its component number, and the number of components.
+    
+    """
+    
+    # vertex -> DFS entry order, and lowest entry order reachable through its subtree
+    order = dict()
+    low = dict()
+    # vertices entered but not yet assigned a component, and the same as a set
+    stack = list()
+    on_stack = set()
+    components = dict()
+    count = 0
+    
+    for root in param_graph.vertices():
+        if root in order:
+            continue
+        
+        order[root] = low[root] = len(order)
+        stack.append(root)
+        on_stack.add(root)
+        # (vertex, iterator over its remaining neighbors) per DFS path vertex
+        path = [(root, iter(param_graph.neighbors(root)))]
+        while len(path) > 0:
+            (vertex, neighbors) = path[-1]
+            for neighbor in neighbors:
+                if neighbor not in order:
+                    order[neighbor] = low[neighbor] = len(order)
+                    stack.append(neighbor)
+                    on_stack.add(neighbor)
+                    path.append((neighbor, iter(param_graph.neighbors(neighbor))))
+                    break
+                if neighbor in on_stack:
+                    low[vertex] = min(low[vertex], order[neighbor])
+            else:
+                path.pop()
+                if len(path) > 0:
+                    parent = path[-1][0]
+                    low[parent] = min(low[parent], low[vertex])
+                # vertex is the first entered of its component, which is on top of it on the stack
+                if low[vertex] == order[vertex]:
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        components[member] = count
+                        if member == vertex:
+                            break
+                    count += 1
+    
+    return (components, count)
+
+def _set_bits(param_bitset):
+    """Find the set bits of a bitset. O(n / 8) for n bits, plus O(1) per set bit.
+    
+    Args:
+        param_bitset (int): Bitset.
+    
+    Returns:
+        generator: Positions of the set bits, lowest first.
+    
+    """
+    
+    # least significant bit first, searched in C rather than shifted bit by bit
+    digits = bin(param_bitset)[:1:-1]
+    position = digits.find("1")
+    while position != -1:
+        yield position
+        position = digits.find("1", position + 1)
+
+class _ReachabilityIndex:
+    """Transitive closure of a graph as bitsets over its strongly connected components.
+    
+    Bit j of component i's forward bitset is set if component i reaches component j, and bit i of 
+    component j's backward bitset is set likewise, so an insertion only visits the components 
+    whose reachability it changes. Bitsets are Python ints, so a graph with C components takes 
+    about C^2 / 4 bytes: 2.5 GB at C = 10^5, and far too much for large DAGs such as a 10^6 node 
+    chain, where every node is its own component. Use searching.breadth_first_search there instead.
+    
+    """
+    
+    __slots__ = ("_components", "_reach", "_reached_by")
+    
+    def __init__(self, param_graph):
+        """Build the index. O(V + E * C / 64).
+        
+        Args:
+            param_graph (Graph): Graph with the traversal methods (vertices, neighbors).
+        
+        """
+        
+        (self._components, count) = _strongly_connected_components(param_graph)
+        
+        # edges between different components, as successor lists of the condensation
+        successors = [set() for _ in range(count)]
+        for (vertex, component) in self._components.items():
+            for neighbor in param_graph.neighbors(vertex):
+                successor = self._components[neighbor]
+                if successor != component:
+                    successors[component].add(successor)
+        
+        # successors are numbered lower, so their forward bitsets are done first
+        self._reach = list()
+        for component in range(count):
+            reach = 1 << component
+            for successor in successors[component]:
+                reach |= self._reach[successor]
+            self._reach.append(reach)
+        
+        # and predecessors higher, so backward bitsets are done from the top
+        self._reached_by = [1 << component for component in range(count)]
+        for component in reversed(range(count)):
+            for successor in successors[component]:
+                self._reached_by[successor] |= self._reached_by[component]
+    
+    def reaches(self, param_start, param_end):
+        """Check if there is a path from one vertex to another. O(C / 64).
+        
+        Args:
+            param_start (Node): Start vertex in the index.
+            param_end (Node): End vertex in the index.
+        
+        Returns:
+            bool: True if reachable, including from a vertex to itself. False if otherwise.
+        
+        """
+        
+        return (self._reach[self._components[param_start]] >> self._components[param_end]) & 1 == 1
+    
+    def add_vertex(self, param_vertex):
+        """Add a vertex without edges. O(1).
+        
+        Args:
+            param_vertex (Node): Vertex to add.
+        
+        """
+        
+        component = len(self._reach)
+        self._components[param_vertex] = component
+        self._reach.append(1 << component)
+        self._reached_by.append(1 << component)
+    
+    def add_edge(self, param_start, param_end):
+        """Update the index for a new edge, unless it joins components into a cycle. O(C / 8 + k * C / 64).
+        
+        k is the number of components whose reachability changes.
+        
+        Args:
+            param_start (Node): Start vertex in the index.
+            param_end (Node): End vertex in the index.
+        
+        Returns:
+            bool: True if the index is up to date. False if it needs to be rebuilt.
+        
+        """
+        
+        # nothing new is reachable
+        if self.reaches(param_start, param_end):
+            return True
+        # the edge merges components
+        if self.reaches(param_end, param_start):
+            return False
+        
+        # whatever reaches the start now reaches everything the end does
+        (start, end) = (self._components[param_start], self._components[param_end])
+        (sources, targets) = (self._reached_by[start], self._reach[end])
+        for component in _set_bits(sources):
+            self._reach[component] |= targets
+        for component in _set_bits(targets):
+            self._reached_by[component] |= sources
+        
+        return True
+
+class _ChunkedDict:
+    """Dict split into chunks by key hash, so that copies share chunks and a write copies one chunk.
+    
+    Keys iterate chunk by chunk, in insertion order within each chunk. The chunk count tracks the 
+    square root of the size, so sharing and copying a chunk are both O(sqrt(n)). Chunks are picked 
+    by the high bits of the hash times a large odd constant, since ints hash to themselves and ids 
+    sharing their low bits would otherwise crowd into one chunk.
+    
+    """
+    
+    __slots__ = ("_chunks", "_owned", "_shift", "_size")
+    
+    def __init__(self, param_items = ()):
+        """Make a map from a dict or from (key, value) pairs. O(n).
+        
+        Args:
+            param_items (dict or iterable): Initial items.
+        
+        """
+        
+        items = param_items.items() if isinstance(param_items, dict) else param_items
+        self._rechunk(list(items))
+    
+    def _rechunk(self, param_items):
+        """Spread items over a chunk count fitting their number, all owned by this map. O(n).
+        
+        Args:
+            param_items (list): (key, value) pairs.
+        
+        """
+        
+        bits = max(4, (len(param_items).bit_length() + 1) // 2)
+        self._chunks = [dict() for _ in range(1 << bits)]
+        self._owned = bytearray(b"\x01") * (1 << bits)
+        self._shift = 64 - bits
+        self._size = len(param_items)
+        for (key, value) in param_items:
+            self._chunks[self._chunk(key)][key] = value
+    
+    def _chunk(self, param_key):
+        """Get the index of a key's chunk. O(1).
+        
+        Args:
+            param_key (hashable): Key.
+        
+        Returns:
+            int: Chunk index.
+        
+        """
+        
+        return ((hash(param_key) * _FIBONACCI_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF) >> self._shift
+    
+    def _writable(self, param_key):
+        """Get a key's chunk for writing, copying it if another map may share it. O(sqrt(n)) once per fork, then O(1).
+        
+        Args:
+            param_key (hashable): Key.
+        
+        Returns:
+            dict: Chunk holding the key.
+        
+        """
+        
+        index = self._chunk(param_key)
+        if not self._owned[index]:
+            self._chunks[index] = self._chunks[index].copy()
+            self._owned[index] = 1
+        
+        return self._chunks[index]
+    
+    def fork(self):
+        """Get a copy sharing all chunks, which this map and the copy each copy on first write. O(sqrt(n)).
+        
+        Returns:
+            _ChunkedDict: Copy.
+        
+        """
+        
+        copy = _ChunkedDict.__new__(_ChunkedDict)
+        (copy._chunks, copy._shift, copy._size) = (list(self._chunks), self._shift, self._size)
+        # neither map may change a chunk in place any more
+        self._owned = bytearray(len(self._chunks))
+        copy._owned = bytearray(len(self._chunks))
+        
+        return copy
+    
+    def __len__(self):
+        """Get the number of keys. O(1).
+        
+        """
+        
+        return self._size
+    
+    def __contains__(self, param_key):
+        """Check if a key is in the map. O(1).
+        
+        """
+        
+        return param_key in self._chunks[self._chunk(param_key)]
+    
+    def __getitem__(self, param_key):
+        """Get a key's value, raising KeyError if it isn't in the map. O(1).
+        
+        """
+        
+        return self._chunks[self._chunk(param_key)][param_key]
+    
+    def get(self, param_key, param_default = None):
+        """Get a key's value, or a default if it isn't in the map. O(1).
+        
+        """
+        
+        return self._chunks[self._chunk(param_key)].get(param_key, param_default)
+    
+    def __setitem__(self, param_key, param_value):
+        """Set a key's value. O(1) amortized, plus copying its chunk if shared.
+        
+        """
+        
+        chunk = self._writable(param_key)
+        if param_key not in chunk:
+            self._size += 1
+        chunk[param_key] = param_value
+        # keep chunks around sqrt(n) long, amortized O(1) per insertion
+        if self._size > 4 * len(self._chunks) * len(self._chunks):
+            self._rechunk(list(self.items()))
+    
+    def __delitem__(self, param_key):
+        """Remove a key, raising KeyError if it isn't in the map. O(1), plus copying its chunk if shared.
+        
+        """
+        
+        del self._writable(param_key)[param_key]
+        self._size -= 1
+    
+    def __iter__(self):
+        """Iterate over the keys. O(n).
+        
+        """
+        
+        for chunk in self._chunks:
+            yield from chunk
+    
+    def values(self):
+        """Get a view of the values. O(1).
+        
+        """
+        
+        return _ChunkedView(self, dict.values)
+    
+    def items(self):
+        """Get a view of the (key, value) pairs. O(1).
+        
+        """
+        
+        return _ChunkedView(self, dict.items)
+
+class _ChunkedView:
+    """Sized view over the values or items of a _ChunkedDict, following its changes like a dict view.
+    
+    """
+    
+    __slots__ = ("_map", "_view")
+    
+    def __init__(self, param_map, param_view):
+        """Make a view. O(1).
+        
+        Args:
+            param_map (_ChunkedDict): Map to view.
+            param_view (function): dict.values or dict.items, applied to each chunk.
+        
+        """
+        
+        (self._map, self._view) = (param_map, param_view)
+    
+    def __len__(self):
+        """Get the number of keys in the map. O(1).
+        
+        """
+        
+        return len(self._map)
+    
+    def __iter__(self):
+        """Iterate over the chunks' views. O(n).
+        
+        """
+        
+        for chunk in self._map._chunks:
+            yield from self._view(chunk)
 
 class Node:
     """A graph node.
         
-    """
+    """
+    
+    __slots__ = ("_data", "_id")
+    
+    def __init__(self, param_id, param_data = None):
+        """Make a node. O(1).
+        
+        Args:
+            param_id (int): Id of new node.
+            param_data (int): Data of new node.
+
+        """
+        
+        self._data = param_data
+        self._id = param_id
+    
+    def __eq__(self, other):
+        """For == comparison. O(1).
+        
+        Returns:
+            bool: True if equal. False if otherwise.
+            
+        """
+        
+        if not isinstance(other, Node):
+            return NotImplemented
+        
+        return (self._data == other._data and self._id == other._id)
+        
+    def __ne__(self, other):
+        """For != comparison. O(1).
+        
+        Returns:
+            bool: True if inequal. False if otherwise.
+            
+        """
+        
+        equal = self.__eq__(other)
+        
+        return equal if equal is NotImplemented else not equal
+    
+    def __hash__(self):
+        """For use in sets and as dict keys. O(1).
+        
+        Only the id is hashed, so equal nodes hash equally. Don't change the id of a node while 
+        it is in a set or dict.
+        
+        Returns:
+            int: Hash of the node id.
+            
+        """
+        
+        return hash(self._id)
+            
+    def get_data(self):
+        """Get a node's data. O(1).
+        
+        Returns:
+            int: Data in node.
+            
+        """
+        
+        return self._data
+        
+    
+    def get_id(self):
+        """Get a node's id. O(1).
+        
+        """
+        
+        return self._id
+        
+    def set_data(self, param_data):
+        """Set a node's data. O(1).
+        
+        Args:
+            param_data (int): New node data.
+            
+        """
+        
+        self._data = param_data
+        
+    def set_id(self, param_id):
+        """Set a node's id. O(1).
+        
+        Args:
+            param_id (int): New node id.
+            
+        """
+        
+        self._id = param_id
+
+class Edge:
+    """A graph edge.
+    
+    """
+    
+    __slots__ = ("_weight", "_nodes")
+    
+    def __init__(self, param_start, param_end, param_weight = None):
+        """Make an edge. O(1).
+        
+        Args:
+            param_start (Node): Starting node of new Edge.
+            param_end (Node): Ending node of new Edge.
+            param_weight (int): Edge weight of new Edge.
+        
+        """
+        
+        self._weight = param_weight
+        self._nodes = (param_start, param_end)
+
+    def __eq__(self, other):
+        """For == comparison. O(1).
+        
+        Returns:
+            bool: True if equal. False if otherwise.
+            
+        """
+        
+        if not isinstance(other, Edge):
+            return NotImplemented
+        
+        return (self._weight == other._weight and 
+                self._nodes[0] == other._nodes[0] and
+                self._nodes[1] == other._nodes[1])
+
+    def __ne__(self, other):
+        """For != comparison. O(1).
+        
+        Returns:
+            bool: True if inequal. False if otherwise.
+            
+        """
+        
+        equal = self.__eq__(other)
+        
+        return equal if equal is NotImplemented else not equal
+    
+    def __hash__(self):
+        """For use in sets and as dict keys. O(1).
+        
+        Only the node ids are hashed, so equal edges hash equally. Don't change the nodes of an 
+        edge while it is in a set or dict.
+        
+        Returns:
+            int: Hash of the node ids.
+            
+        """
+        
+        return hash((self._nodes[0].get_id(), self._nodes[1].get_id()))
+                    
+    def get_nodes(self):
+        """Get an edge's nodes. O(1).
+        
+        """
+        
+        return self._nodes
+    
+    def get_weight(self):
+        """Get an edge's weight. O(1).
+        
+        """
+        
+        return self._weight
+    
+    def set_edge(self, new_edge):
+        """Set an edge's nodes. O(1).
+        
+        """
+        
+        self._nodes = new_edge
+        
+    def set_weight(self, new_weight):
+        """Set an edge's weight. O(1).
+        
+        """
+        
+        self._weight = new_weight
+    
+    def flip(self):
+        """Reverse an edge. O(1).
+        
+        Returns:
+            Edge: Reversed edge, sharing this edge's nodes.
+        """
+        
+        return Edge(self._nodes[1], self._nodes[0], self._weight)
+        
+class Graph:
+    """A graph of Nodes and Edges.
+    
+    Nodes are indexed by id, and each node's outgoing edges are indexed by the id of the node 
+    they lead to, so there is at most one edge from one node to another. An undirected edge is 
+    one Edge indexed from both of its nodes, so setting its weight shows on both sides, and it 
+    keeps the orientation it was added with.
+    
+    Connectivity queries use a union-find index over the nodes, ignoring edge direction. It is 
+    built on the first query, or up front if requested, and then kept up to date by add_node and 
+    add_edge. Reachability queries on directed graphs use a transitive closure index, also built 
+    on the first query. add_node and add_edge patch it, and an edge that merges strongly connected 
+    components drops it to be rebuilt by the next query. Removals drop both indexes, so batched 
+    removals pay for one rebuild. The reachability index takes about C^2 / 4 bytes for C strongly 
+    connected components, and while it exists add_edge also pays for patching it, O(C / 8) plus 
+    O(C / 64) per component whose reachability changes; avoid it on large DAGs.
+    
+    Writes are serialized by a lock, but reading while another thread writes isn't safe. Readers 
+    should traverse snapshots instead, which share structure with the graph and are copied on 
+    write. Taking a snapshot holds the lock for O(sqrt(V)), so it waits for a write in progress, 
+    and each write after it copies O(sqrt(V)) of the node index plus the edge dicts it changes.
+    
+    """
+    
+    
+    def __init__(self, param_directed = False, param_components = False):
+        """Make an empty graph. O(1).
+        
+        Args:
+            param_directed (bool): Is graph directed.
+            param_components (bool): Maintain the union-find index from the start.
+
+        """
+        
+        # node id -> Node
+        self._nodes = dict()
+        # node id -> (neighbor node id -> Edge), undirected edges are shared by both nodes
+        self._edges = dict()
+        # node id -> (predecessor node id -> Edge), only kept apart from _edges when directed
+        self._reverse_edges = dict() if param_directed else self._edges
+        self._directed = param_directed
+        # union-find over node ids, None until first needed
+        self._components = _UnionFind() if param_components else None
+        # whether an edge ever closed a cycle, only tracked alongside _components
+        self._closed_cycle = False
+        # transitive closure for directed graphs, None until first needed
+        self._reachability = None
+        # node ids whose edge dicts were copied since the last snapshot, None if there never was one
+        self._owned_edges = None
+        self._owned_reverse_edges = None
+        # serializes writers, readers use snapshots instead
+        self._write_lock = threading.RLock()
+        
+    def __getstate__(self):
+        """For pickling, leaving out the lock. O(1).
+        
+        """
+        
+        state = self.__dict__.copy()
+        del state["_write_lock"]
+        
+        return state
+    
+    def __setstate__(self, state):
+        """For unpickling, with a new lock. O(1).
+        
+        """
+        
+        self.__dict__.update(state)
+        self._write_lock = threading.RLock()
+        
+    @classmethod
+    def from_edge_list(cls, param_path, param_format = "csv", param_directed = False):
+        """Load a graph from an edge list file. O(V + E).
+        
+        Edges are read in chunks of columns (see FrozenGraph.from_edge_list for the formats) and 
+        stored straight into the graph's dicts, following add_edge's rules without a call and a 
+        caller-made Edge per line. Each stored edge is still an Edge object; load a FrozenGraph 
+        to skip those entirely.
+        
+        Args:
+            param_path (str): Path of the file.
+            param_format (str): "csv" or "bin".
+            param_directed (bool): Is graph directed.
+        
+        Returns:
+            Graph: Loaded graph, with Nodes holding no data.
+        
+        """
+        
+        graph = cls(param_directed)
+        graph._fill(list(), _read_edge_list(param_path, param_format))
+        
+        return graph
+    
+    @classmethod
+    def load(cls, param_path, param_mmap = True):
+        """Load a graph saved by save. O(V + E).
+        
+        The file is read through FrozenGraph.load and its CSR arrays stored straight into the 
+        graph's dicts, like from_edge_list. Load a FrozenGraph directly when an immutable graph will 
+        do, since it maps the file without building anything.
+        
+        Args:
+            param_path (str): Path of the file.
+            param_mmap (bool): Memory map the file instead of reading it into memory first.
+        
+        Returns:
+            Graph: Loaded graph, with Nodes holding no data.
+        
+        """
+        
+        frozen = FrozenGraph.load(param_path, param_mmap)
+        graph = cls(frozen.is_directed())
+        graph._fill(frozen.get_ids(), _frozen_edge_columns(frozen))
+        
+        return graph
+    
+    def _fill(self, param_ids, param_columns):
+        """Store nodes and edge columns straight into the dicts, following add_edge's rules. O(V + E).
+        
+        Skips add_node and add_edge, with their locking, index upkeep, and copy-on-write checks, so 
+        it is only for new graphs that no snapshot or index has seen yet.
+        
+        Args:
+            param_ids (iterable): Node ids to add first, so nodes without edges are kept.
+            param_columns (iterable): (start ids, end ids, weights) per chunk, weights NaN if unset.
+        
+        """
+        
+        (nodes, edges, reverse_edges, directed) = (self._nodes, self._edges, self._reverse_edges, self._directed)
+        
+        for node_id in param_ids:
+            if node_id not in nodes:
+                (nodes[node_id], edges[node_id]) = (Node(node_id), dict())
+                if directed:
+                    reverse_edges[node_id] = dict()
+        
+        for (starts, ends, weights) in param_columns:
+            for (start_id, end_id, weight) in zip(starts, ends, weights):
+                for node_id in (start_id, end_id):
+                    if node_id not in nodes:
+                        (nodes[node_id], edges[node_id]) = (Node(node_id), dict())
+                        if directed:
+                            reverse_edges[node_id] = dict()
+                
+                start_edges = edges[start_id]
+                if end_id in start_edges:
+                    continue
+                
+                edge = Edge(nodes[start_id], nodes[end_id], None if isnan(weight) else weight)
+                start_edges[end_id] = edge
+                if directed:
+                    reverse_edges[end_id][start_id] = edge
+                elif start_id != end_id:
+                    edges[end_id][start_id] = edge
+    
+    def save(self, param_path):
+        """Save the graph in FrozenGraph's binary format. O(V + E).
+        
+        Node data isn't saved.
+        
+        Args:
+            param_path (str): Path of the file.
+        
+        """
+        
+        self.freeze().save(param_path)
+    
+    def _writable_edges(self, param_index, param_owned, param_id):
+        """Get a node's edge dict for writing, copying it if a snapshot may share it. O(degree) once per version, then O(1).
+        
+        Args:
+            param_index (_ChunkedDict): _edges or _reverse_edges.
+            param_owned (set): Node ids whose dicts in param_index belong to this version only. None if no snapshot was ever taken.
+            param_id (int): Node id.
+        
+        Returns:
+            dict: Node's edge dict in param_index.
+        
+        """
+        
+        edges = param_index[param_id]
+        if param_owned is not None and param_id not in param_owned:
+            edges = param_index[param_id] = edges.copy()
+            param_owned.add(param_id)
+        
+        return edges
+    
+    def snapshot(self):
+        """Get a consistent version of the graph that later writes don't change. O(sqrt(V)), O(V) the first time.
+        
+        The first snapshot splits the graph's top-level dicts into chunks by node id hash (O(V) 
+        once), after which nodes iterate chunk by chunk rather than in insertion order. Later 
+        snapshots share the O(sqrt(V)) chunks, taking the write lock for that long. Each version 
+        copies a chunk the first time it writes to it (O(sqrt(V))), and each node's edge dict the 
+        first time it writes to that (O(degree)), so a version never changes once other versions 
+        can see it. Readers can traverse a snapshot without locks while a writer keeps going, 
+        and versions are freed once nothing refers to them. Edges and Nodes are shared too: 
+        change weights through set_weight rather than Edge.set_weight, and node data isn't 
+        versioned.
+        
+        Returns:
+            Graph: Snapshot, sharing the graph's nodes and edges. Writing to it forks it.
+        
+        """
+        
+        with self._write_lock:
+            # a new graph, since the indexes are patched in place and the snapshot needs its own
+            snapshot = self.__class__(self._directed)
+            # the first snapshot moves the top-level dicts into chunks that versions can share
+            if self._owned_edges is None:
+                self._nodes = _ChunkedDict(self._nodes)
+                self._edges = _ChunkedDict(self._edges)
+                self._reverse_edges = _ChunkedDict(self._reverse_edges) if self._directed else self._edges
+            
+            # both versions copy a chunk or an edge dict before changing it
+            (snapshot._nodes, snapshot._edges) = (self._nodes.fork(), self._edges.fork())
+            snapshot._reverse_edges = self._reverse_edges.fork() if self._directed else snapshot._edges
+            for graph in (self, snapshot):
+                graph._owned_edges = set()
+                graph._owned_reverse_edges = set() if self._directed else graph._owned_edges
+        
+        return snapshot
+    
+    def add_node(self, param_node):
+        """Add a node if its id is unique to the graph's current nodes. O(1).
+        
+        Args:
+            param_node (Node): Node to add.
+        
+        Returns:
+            bool: True if added. False if otherwise.
+        """
+        
+        node_id = param_node.get_id()
+        
+        with self._write_lock:
+            # check presence in nodes dict
+            if node_id in self._nodes:
+                return False
+            
+            # add to nodes dict and edges dict
+            # absense in nodes dict implies absense in edges dict
+            self._nodes[node_id] = param_node
+            self._edges[node_id] = dict()
+            if self._directed:
+                self._reverse_edges[node_id] = dict()
+            # new dicts belong to this version
+            if self._owned_edges is not None:
+                self._owned_edges.add(node_id)
+                self._owned_reverse_edges.add(node_id)
+            if self._components is not None:
+                self._components.add(node_id)
+            if self._reachability is not None:
+                self._reachability.add_vertex(param_node)
+            return True
+                        
+    def add_edge(self, param_edge):
+        """Add an edge if its nodes aren't already connected in its direction. O(1) without the reachability index.
+        
+        While the reachability index is built, patching it costs O(C / 8) plus O(C / 64) per 
+        component whose reachability changes, for C strongly connected components.
+        
+        Args:
+            param_edge (Edge): Edge to add.
+            
+        Returns:
+            bool: True if added. False if otherwise.
+            
+        """
+        
+        (start, end) = param_edge.get_nodes()
+        start_id, end_id = start.get_id(), end.get_id()
+        
+        with self._write_lock:
+            # add nodes if not in nodes container
+            self.add_node(start)
+            self.add_node(end)
+            
+            # add edge if not in edges container
+            if end_id in self._edges[start_id]:
+                return False
+            
+            self._writable_edges(self._edges, self._owned_edges, start_id)[end_id] = param_edge
+            # index the edge from its end too, which is its other side if undirected
+            if self._directed:
+                self._writable_edges(self._reverse_edges, self._owned_reverse_edges, end_id)[start_id] = param_edge
+            elif start_id != end_id:
+                self._writable_edges(self._edges, self._owned_edges, end_id)[start_id] = param_edge
+            
+            # an edge between already connected nodes closes a cycle
+            if self._components is not None and not self._components.union(start_id, end_id):
+                self._closed_cycle = True
+            if self._reachability is not None and not self._reachability.add_edge(self._nodes[start_id], self._nodes[end_id]):
+                self._reachability = None
+
+            return True
+    
+    def _drop_indexes(self):
+        """Drop the connectivity and reachability indexes after a removal, to be rebuilt when next needed. O(1).
+        
+        """
+        
+        self._components = None
+        self._closed_cycle = False
+        self._reachability = None
+    
+    def _remove_edge(self, param_start_id, param_end_id):
+        """Remove the edge from one node id to another, leaving the indexes alone. O(1).
+        
+        Args:
+            param_start_id (int): Start node id.
+            param_end_id (int): End node id.
+        
+        Returns:
+            bool: True if removed. False if otherwise.
+        
+        """
+        
+        edges = self._edges.get(param_start_id)
+        if edges is None or param_end_id not in edges:
+            return False
+        
+        del self._writable_edges(self._edges, self._owned_edges, param_start_id)[param_end_id]
+        # the end node indexes the edge too, unless it is an undirected self loop
+        if self._directed or param_start_id != param_end_id:
+            del self._writable_edges(self._reverse_edges, self._owned_reverse_edges, param_end_id)[param_start_id]
+        
+        return True
+    
+    def _remove_node(self, param_id):
+        """Remove a node id and its edges, leaving the indexes alone. O(degree).
+        
+        Args:
+            param_id (int): Node id.
+        
+        Returns:
+            bool: True if removed. False if otherwise.
+        
+        """
+        
+        if param_id not in self._nodes:
+            return False
+        
+        # unlink the edges from the other node that indexes them
+        for neighbor_id in self._edges[param_id]:
+            if neighbor_id != param_id:
+                del self._writable_edges(self._reverse_edges, self._owned_reverse_edges, neighbor_id)[param_id]
+        if self._directed:
+            for predecessor_id in self._reverse_edges[param_id]:
+                if predecessor_id != param_id:
+                    del self._writable_edges(self._edges, self._owned_edges, predecessor_id)[param_id]
+            del self._reverse_edges[param_id]
+        
+        del self._edges[param_id]
+        del self._nodes[param_id]
+        # a node added again with this id gets new dicts
+        if self._owned_edges is not None:
+            self._owned_edges.discard(param_id)
+            self._owned_reverse_edges.discard(param_id)
+        
+        return True
+    
+    def remove_edge(self, param_edge):
+        """Remove the edge between an edge's nodes in its direction, whatever its weight. O(1).
+        
+        Undirected edges are removed in either orientation. Removing edges drops the connectivity 
+        and reachability indexes, which are rebuilt by the next query that needs them.
+        
+        Args:
+            param_edge (Edge): Edge to remove.
+        
+        Returns:
+            bool: True if removed. False if otherwise.
+        
+        """
+        
+        (start, end) = param_edge.get_nodes()
+        with self._write_lock:
+            if not self._remove_edge(start.get_id(), end.get_id()):
+                return False
+            
+            self._drop_indexes()
+            return True
+    
+    def remove_edges(self, param_edges):
+        """Remove several edges, dropping the indexes once. O(k) for k edges.
+        
+        Args:
+            param_edges (iterable): Edges to remove.
+        
+        Returns:
+            int: Number of edges removed.
+        
+        """
+        
+        removed = 0
+        with self._write_lock:
+            for edge in param_edges:
+                (start, end) = edge.get_nodes()
+                removed += self._remove_edge(start.get_id(), end.get_id())
+            
+            if removed > 0:
+                self._drop_indexes()
+        return removed
+    
+    def remove_node(self, param_node):
+        """Remove a node and its edges. O(degree).
+        
+        Removing nodes drops the connectivity and reachability indexes, which are rebuilt by the 
+        next query that needs them.
+        
+        Args:
+            param_node (Node): Node to remove.
+        
+        Returns:
+            bool: True if removed. False if otherwise.
+        
+        """
+        
+        with self._write_lock:
+            if not self._remove_node(param_node.get_id()):
+                return False
+            
+            self._drop_indexes()
+            return True
+    
+    def remove_nodes(self, param_nodes):
+        """Remove several nodes and their edges, dropping the indexes once. O(sum of degrees).
+        
+        Args:
+            param_nodes (iterable): Nodes to remove.
+        
+        Returns:
+            int: Number of nodes removed.
+        
+        """
+        
+        removed = 0
+        with self._write_lock:
+            for node in param_nodes:
+                removed += self._remove_node(node.get_id())
+            
+            if removed > 0:
+                self._drop_indexes()
+        return removed
+    
+    def set_weight(self, param_edge, param_weight):
+        """Set the weight of the edge between an edge's nodes in its direction. O(1).
+        
+        Both nodes index the same Edge, so the change shows from either side. Once snapshots have 
+        been taken, the stored Edge is replaced by a reweighted one instead of being changed, 
+        since older versions may share it.
+        
+        Args:
+            param_edge (Edge): Edge whose nodes to look up, in either orientation if undirected.
+            param_weight (int): New edge weight.
+        
+        Returns:
+            bool: True if set. False if the edge isn't in the graph.
+        
+        """
+        
+        (start, end) = param_edge.get_nodes()
+        with self._write_lock:
+            edge = self._edges.get(start.get_id(), dict()).get(end.get_id())
+            if edge is None:
+                return False
+            
+            if self._owned_edges is None:
+                edge.set_weight(param_weight)
+                return True
+            
+            # index the replacement wherever the old edge was
+            (edge_start, edge_end) = edge.get_nodes()
+            (start_id, end_id) = (edge_start.get_id(), edge_end.get_id())
+            edge = Edge(edge_start, edge_end, param_weight)
+            self._writable_edges(self._edges, self._owned_edges, start_id)[end_id] = edge
+            if self._directed:
+                self._writable_edges(self._reverse_edges, self._owned_reverse_edges, end_id)[start_id] = edge
+            elif start_id != end_id:
+                self._writable_edges(self._edges, self._owned_edges, end_id)[start_id] = edge
+            return True
+       
+    def get_nodes(self):
+        """Get all nodes. O(1).
+        
+        Returns:
+            dict_values: Graph nodes.
+        
+        """
+        
+        return self._nodes.values()
+            
+    def get_edges(self, param_node):
+        """Get a node's edges. O(1).
+        
+        Undirected edges are the stored ones, so the node may be at either end of them.
+        
+        Args:
+            param_node (Node): Node whose edges to find.
+            
+        Returns:
+            dict_values: Edges. None if otherwise.
+            
+        """
+        
+        edges = self._edges.get(param_node.get_id())
+        
+        return None if edges is None else edges.values()
+                        
+    def get_node(self, param_id):
+        """Get a node by id. O(1).
+        
+        Args:
+            param_id (int): Node id to search.
+            
+        Returns:
+            Node: Node with matching id. None if otherwise.
+            
+        """
+        
+        return self._nodes.get(param_id)
+
+    def is_node(self, param_node):
+        """Check for a node in graph. O(1).
+        
+        Args:
+            param_node (Node): Node to check.
+        
+        Returns:
+            bool: True if in graph. False if otherwise.
+        """
+        
+        return self._nodes.get(param_node.get_id()) == param_node
+        
+    def is_edge(self, param_edge):
+        """Check for an edge in graph. O(1).
+        
+        Args:
+            param_edge (Edge): Edge to check.
+            
+        Return:
+            bool: True if edge in graph. False if otherwise.
+        
+        """
+        
+        (start, end) = param_edge.get_nodes()
+        
+        # possible edges
+        edges_to_check = self._edges.get(start.get_id())
+        
+        # end early
+        if edges_to_check is None:
+            return False
+        
+        # check edge
+        edge = edges_to_check.get(end.get_id())
+        if edge is None:
+            return False
+        if edge == param_edge:
+            return True
+        
+        # undirected edges match in either orientation
+        return (not self._directed and edge.get_weight() == param_edge.get_weight() 
+                and edge.get_nodes() == (end, start))
+             
+    def is_directed(self):
+        """Check if the graph is directed. O(1).
+        
+        Returns:
+            bool: True if directed. False if otherwise.
+        
+        """
+        
+        return self._directed
+    
+    def vertices(self):
+        """Get all vertices for traversals. O(1).
+        
+        Returns:
+            dict_values: Graph nodes.
+        
+        """
+        
+        return self._nodes.values()
+    
+    def neighbors(self, param_node):
+        """Get the nodes a node has edges to. O(1).
+        
+        Args:
+            param_node (Node): Node whose neighbors to find.
+        
+        Returns:
+            generator: Neighbor nodes.
+        
+        """
+        
+        return (self._nodes[node_id] for node_id in self._edges[param_node.get_id()])
+    
+    def weighted_neighbors(self, param_node):
+        """Get the nodes a node has edges to, with the edge weights. O(1).
+        
+        Args:
+            param_node (Node): Node whose neighbors to find.
+        
+        Returns:
+            generator: (Node, weight) pairs. Weight is None if unset.
+        
+        """
+        
+        return ((self._nodes[node_id], edge.get_weight()) 
+                for (node_id, edge) in self._edges[param_node.get_id()].items())
+    
+    def weighted_predecessors(self, param_node):
+        """Get the nodes with edges to a node, with the edge weights. O(1).
+        
+        Same as weighted_neighbors for an undirected graph.
+        
+        Args:
+            param_node (Node): Node whose predecessors to find.
+        
+        Returns:
+            generator: (Node, weight) pairs. Weight is None if unset.
+        
+        """
+        
+        return ((self._nodes[node_id], edge.get_weight()) 
+                for (node_id, edge) in self._reverse_edges[param_node.get_id()].items())
+    
+    def freeze(self):
+        """Make an immutable CSR snapshot of the graph. O(V + E).
+        
+        Returns:
+            FrozenGraph: Snapshot with nodes numbered in insertion order.
+        
+        """
+        
+        index = {node_id: i for (i, node_id) in enumerate(self._nodes)}
+        
+        indptr = array("q", [0])
+        indices = array("q")
+        weights = array("d")
+        for edges in self._edges.values():
+            for (node_id, edge) in edges.items():
+                indices.append(index[node_id])
+                weights.append(_to_column_weight(edge.get_weight()))
+            indptr.append(len(indices))
+        
+        return FrozenGraph(array("q", self._nodes), indptr, indices, 
+                           _optional_weights(weights), self._directed)
+             
+    def is_cyclic(self):
+        """Check if the graph is cyclic. O(V + E), O(1) once the union-find index is built if undirected.
+        
+        Directed graphs use iterative DFS, so long paths can't hit the recursion limit. Undirected 
+        graphs are cyclic once an edge joins two already connected nodes, which add_edge records 
+        while the union-find index is maintained.
+        
+        Returns:
+            bool: True if cyclic. False if otherwise.
+        """
+        
+        if not self._directed:
+            self._get_components()
+            return self._closed_cycle
+        
+        return _find_cycle(self) is not None
+    
+    def find_cycle(self):
+        """Find a cycle in the graph. O(V + E).
+        
+        Returns:
+            list: Cycle's vertices in path order. None if acyclic.
+        """
+        
+        return _find_cycle(self)
+    
+    def topological_order(self):
+        """Order a directed graph's vertices so every edge points forward. O(V + E).
+        
+        Returns:
+            dict: {"order": vertex list, None if cyclic, 
+                   "cycle": vertex list witnessing why no order exists, None if acyclic}
+        """
+        
+        return _topological_order(self)
+    
+    def _get_components(self):
+        """Get the union-find index, building it if needed. O(V + E) to build, O(1) otherwise.
+        
+        Returns:
+            _UnionFind: Index over the graph's node ids.
+        
+        """
+        
+        if self._components is None:
+            components = _UnionFind()
+            closed_cycle = False
+            for node_id in self._nodes:
+                components.add(node_id)
+            # undirected edges are stored both ways, skip the copy stored at an already seen node
+            seen = set()
+            for (node_id, edges) in self._edges.items():
+                for neighbor_id in edges:
+                    if neighbor_id in seen:
+                        continue
+                    if not components.union(node_id, neighbor_id):
+                        closed_cycle = True
+                if not self._directed:
+                    seen.add(node_id)
+            (self._components, self._closed_cycle) = (components, closed_cycle)
+        
+        return self._components
+    
+    def connected(self, param_a, param_b):
+        """Check if two nodes are in the same component, ignoring edge direction. O(α(V)) amortized.
+        
+        Args:
+            param_a (Node): Node to check.
+            param_b (Node): Node to check.
+        
+        Returns:
+            bool: True if connected. False if otherwise, or if either node isn't in the graph.
+        
+        """
+        
+        (a_id, b_id) = (param_a.get_id(), param_b.get_id())
+        if a_id not in self._nodes or b_id not in self._nodes:
+            return False
+        
+        components = self._get_components()
+        
+        return components.find(a_id) == components.find(b_id)
+    
+    def component_of(self, param_node):
+        """Get the representative of a node's component, ignoring edge direction. O(α(V)) amortized.
+        
+        Nodes are connected exactly when they have the same representative, until the next 
+        add_edge merges components.
+        
+        Args:
+            param_node (Node): Node whose component to find.
+        
+        Returns:
+            Node: Representative node. None if node isn't in the graph.
+        
+        """
+        
+        node_id = param_node.get_id()
+        if node_id not in self._nodes:
+            return None
+        
+        return self._nodes[self._get_components().find(node_id)]
+    
+    def component_count(self):
+        """Get the number of components, ignoring edge direction. O(1).
+        
+        Returns:
+            int: Number of components.
+        
+        """
+        
+        return self._get_components().count()
+    
+    def reachable(self, param_start, param_end):
+        """Check if there is a path from one node to another. O(C / 64) once the index is built.
+        
+        Directed graphs build the reachability index on first use, in O(V + E * C / 64) for C 
+        strongly connected components, and keep it in about C^2 / 4 bytes. That is too much for 
+        large DAGs, whose nodes are all separate components; use searching.breadth_first_search 
+        there. Undirected graphs answer from the union-find index.
+        
+        Args:
+            param_start (Node): Start node.
+            param_end (Node): End node.
+        
+        Returns:
+            bool: True if reachable, including from a node to itself. False if otherwise, or if 
+                either node isn't in the graph.
+        
+        """
+        
+        if not self._directed:
+            return self.connected(param_start, param_end)
+        
+        (start, end) = (self._nodes.get(param_start.get_id()), self._nodes.get(param_end.get_id()))
+        if start is None or end is None:
+            return False
+        
+        if self._reachability is None:
+            self._reachability = _ReachabilityIndex(self)
+        
+        return self._reachability.reaches(start, end)
+        
+    def print_nodes(self):
+        """Print all nodes. O(V).
+        
+        """
+        
+        print("~~~Nodes~~~")
+        for node in self._nodes.values():
+            print("Node id: {}".format(node.get_id()))
+            print("  data: {}".format(node.get_data()))
+
+    def print_edges(self):
+        """Print all edges. O(V + E).
+        
+        """
+        
+        print("~~~Edges~~~")
+        for (node_id, edges) in self._edges.items():
+            print("start Node id: {}".format(node_id))
+            for neighbor_id in edges:
+                print("  end Node id: {}".format(neighbor_id))
+                
+class NodeView:
+    """A lightweight view of a node stored in a CompactGraph.
+    
+    Supports the same methods as Node, reading and writing the graph's columns.
+    
+    """
+    
+    __slots__ = ("_graph", "_index")
+    
+    def __init__(self, param_graph, param_index):
+        """Make a view. O(1).
+        
+        Args:
+            param_graph (CompactGraph): Graph storing the node.
+            param_index (int): Dense index of the node in the graph.
+
+        """
+        
+        self._graph = param_graph
+        self._index = param_index
+    
+    def __eq__(self, other):
+        """For == comparison with a Node or NodeView. O(1).
+        
+        Returns:
+            bool: True if equal. False if otherwise.
+            
+        """
+        
+        if not isinstance(other, (Node, NodeView)):
+            return NotImplemented
+        
+        return (self.get_data() == other.get_data() and self.get_id() == other.get_id())
+    
+    def __ne__(self, other):
+        """For != comparison. O(1).
+        
+        Returns:
+            bool: True if inequal. False if otherwise.
+            
+        """
+        
+        equal = self.__eq__(other)
+        
+        return equal if equal is NotImplemented else not equal
+    
+    def __hash__(self):
+        """For use in sets and as dict keys. O(1).
+        
+        Returns:
+            int: Hash of the node id, same as Node.
+            
+        """
+        
+        return hash(self.get_id())
+    
+    def get_data(self):
+        """Get a node's data. O(1).
+        
+        """
+        
+        return self._graph._data[self._index]
+    
+    def get_id(self):
+        """Get a node's id. O(1).
+        
+        """
+        
+        return self._graph._ids[self._index]
+    
+    def set_data(self, param_data):
+        """Set a node's data. O(1).
+        
+        Args:
+            param_data (int): New node data.
+            
+        """
+        
+        self._graph._data[self._index] = param_data
+
+class EdgeView:
+    """A lightweight view of an edge stored in a CompactGraph.
+    
+    Supports the read methods of Edge, plus set_weight. An edge of an undirected graph is 
+    stored once and viewed from either end.
+    
+    """
+    
+    __slots__ = ("_graph", "_index", "_flipped")
+    
+    def __init__(self, param_graph, param_index, param_flipped = False):
+        """Make a view. O(1).
+        
+        Args:
+            param_graph (CompactGraph): Graph storing the edge.
+            param_index (int): Index of the edge in the graph.
+            param_flipped (bool): View the edge from its end node.
+
+        """
+        
+        self._graph = param_graph
+        self._index = param_index
+        self._flipped = param_flipped
+    
+    def __eq__(self, other):
+        """For == comparison with an Edge or EdgeView. O(1).
+        
+        Returns:
+            bool: True if equal. False if otherwise.
+            
+        """
+        
+        if not isinstance(other, (Edge, EdgeView)):
+            return NotImplemented
+        
+        (start, end) = self.get_nodes()
+        (other_start, other_end) = other.get_nodes()
+        
+        return (self.get_weight() == other.get_weight() and start == other_start and end == other_end)
+    
+    def __ne__(self, other):
+        """For != comparison. O(1).
+        
+        Returns:
+            bool: True if inequal. False if otherwise.
+            
+        """
+        
+        equal = self.__eq__(other)
+        
+        return equal if equal is NotImplemented else not equal
+    
+    def __hash__(self):
+        """For use in sets and as dict keys. O(1).
+        
+        Returns:
+            int: Hash of the node ids, same as Edge.
+            
+        """
+        
+        (start, end) = self.get_nodes()
+        
+        return hash((start.get_id(), end.get_id()))
+    
+    def get_nodes(self):
+        """Get an edge's nodes. O(1).
+        
+        """
+        
+        start = NodeView(self._graph, self._graph._edge_starts[self._index])
+        end = NodeView(self._graph, self._graph._edge_ends[self._index])
+        
+        return (end, start) if self._flipped else (start, end)
+    
+    def get_weight(self):
+        """Get an edge's weight. O(1).
+        
+        """
+        
+        weight = self._graph._edge_weights[self._index]
+        
+        return None if isnan(weight) else weight
+    
+    def set_weight(self, new_weight):
+        """Set an edge's weight, for both directions of an undirected edge. O(1).
+        
+        """
+        
+        self._graph._edge_weights[self._index] = _to_column_weight(new_weight)
+    
+    def flip(self):
+        """Reverse an edge. O(1).
+        
+        Returns:
+            EdgeView: View of the same edge from its other end.
+        """
+        
+        return EdgeView(self._graph, self._index, not self._flipped)
+
+class CompactGraph:
+    """A graph of nodes and edges stored as columns.
+    
+    Node ids, node data, edge endpoints, and edge weights live in flat arrays instead of one 
+    object per node and edge, and each undirected edge is stored once. Nodes and edges are added 
+    as Node and Edge objects, and handed out as NodeView and EdgeView objects made on demand. 
+    Checking for an edge scans the start node's edges, which is O(degree) but short for most 
+    nodes. Nodes with many edges also keep a dict from neighbor to edge, so checking and adding 
+    their edges stays O(1) and building a high degree node isn't quadratic.
+    
+    """
+    
+    def __init__(self, param_directed = False):
+        """Make an empty graph. O(1).
+        
+        Args:
+            param_directed (bool): Is graph directed.
+
+        """
+        
+        # node index -> node id, data, and edge indices
+        self._ids = array("q")
+        self._data = list()
+        self._adjacency = list()
+        # node index -> indices of edges ending there, only kept apart from _adjacency when directed
+        self._reverse_adjacency = list() if param_directed else self._adjacency
+        # node id -> node index
+        self._index = dict()
+        # node index -> (neighbor node index -> edge index), only for nodes with many edges
+        self._neighbor_index = dict()
+        # edge index -> start node index, end node index, and weight (NaN if None)
+        self._edge_starts = array("q")
+        self._edge_ends = array("q")
+        self._edge_weights = array("d")
+        self._directed = param_directed
+    
+    def _find_edge(self, param_start, param_end):
+        """Find the edge from one node index to another. O(1) for indexed nodes, O(degree) otherwise.
+        
+        Args:
+            param_start (int): Start node index.
+            param_end (int): End node index.
+        
+        Returns:
+            EdgeView: Edge. None if otherwise.
+        """
+        
+        neighbors = self._neighbor_index.get(param_start)
+        if neighbors is not None:
+            edge_index = neighbors.get(param_end)
+            if edge_index is None:
+                return None
+            # undirected edges keep the orientation they were added with
+            return EdgeView(self, edge_index, self._edge_starts[edge_index] != param_start)
+        
+        for edge_index in self._adjacency[param_start]:
+            if self._edge_starts[edge_index] == param_start and self._edge_ends[edge_index] == param_end:
+                return EdgeView(self, edge_index)
+            if not self._directed and self._edge_ends[edge_index] == param_start and self._edge_starts[edge_index] == param_end:
+                return EdgeView(self, edge_index, True)
+        
+        return None
+    
+    def _index_neighbor(self, param_index, param_neighbor, param_edge_index):
+        """Record a node's new edge in its neighbor index, making the index once the node has enough edges. O(1) amortized.
+        
+        Args:
+            param_index (int): Node index, with the edge already in its adjacency.
+            param_neighbor (int): Node index at the edge's other end.
+            param_edge_index (int): Edge index.
+        
+        """
+        
+        neighbors = self._neighbor_index.get(param_index)
+        if neighbors is not None:
+            neighbors[param_neighbor] = param_edge_index
+        elif len(self._adjacency[param_index]) >= _COMPACT_INDEX_DEGREE:
+            (starts, ends) = (self._edge_starts, self._edge_ends)
+            self._neighbor_index[param_index] = {ends[edge_index] if starts[edge_index] == param_index else starts[edge_index]: edge_index 
+                                                 for edge_index in self._adjacency[param_index]}
+    
+    def add_node(self, param_node):
+        """Add a node if its id is unique to the graph's current nodes. O(1).
+        
+        Args:
+            param_node (Node): Node to add.
+        
+        Returns:
+            bool: True if added. False if otherwise.
+        """
+        
+        node_id = param_node.get_id()
+        
+        # check presence in index
+        if node_id in self._index:
+            return False
+        
+        self._index[node_id] = len(self._ids)
+        self._ids.append(node_id)
+        self._data.append(param_node.get_data())
+        self._adjacency.append(array("q"))
+        if self._directed:
+            self._reverse_adjacency.append(array("q"))
+        return True
+    
+    def add_edge(self, param_edge):
+        """Add an edge if its nodes aren't already connected in its direction. O(1) amortized for indexed nodes, O(degree) otherwise.
+        
+        Args:
+            param_edge (Edge): Edge to add.
+            
+        Returns:
+            bool: True if added. False if otherwise.
+            
+        """
+        
+        (start, end) = param_edge.get_nodes()
+        
+        # add nodes if not in index
+        self.add_node(start)
+        self.add_node(end)
+        start_index, end_index = self._index[start.get_id()], self._index[end.get_id()]
+        
+        # add edge if not in columns
+        if self._find_edge(start_index, end_index) is not None:
+            return False
+        
+        edge_index = len(self._edge_starts)
+        self._edge_starts.append(start_index)
+        self._edge_ends.append(end_index)
+        self._edge_weights.append(_to_column_weight(param_edge.get_weight()))
+        self._adjacency[start_index].append(edge_index)
+        self._index_neighbor(start_index, end_index, edge_index)
+        # undirected edges are listed by both nodes
+        if self._directed:
+            self._reverse_adjacency[end_index].append(edge_index)
+        elif start_index != end_index:
+            self._adjacency[end_index].append(edge_index)
+            self._index_neighbor(end_index, start_index, edge_index)
+        
+        return True
+    
+    def get_nodes(self):
+        """Get all nodes. O(V).
+        
+        Returns:
+            list: Graph nodes as NodeViews.
+        
+        """
+        
+        return [NodeView(self, index) for index in range(len(self._ids))]
+    
+    def get_edges(self, param_node):
+        """Get a node's edges. O(degree).
+        
+        Args:
+            param_node (Node): Node whose edges to find.
+            
+        Returns:
+            list: Edges as EdgeViews starting at the node. None if otherwise.
+            
+        """
+        
+        index = self._index.get(param_node.get_id())
+        if index is None:
+            return None
+        
+        return [EdgeView(self, edge_index, self._edge_starts[edge_index] != index) 
+                for edge_index in self._adjacency[index]]
+    
+    def get_node(self, param_id):
+        """Get a node by id. O(1).
+        
+        Args:
+            param_id (int): Node id to search.
+            
+        Returns:
+            NodeView: Node with matching id. None if otherwise.
+            
+        """
+        
+        index = self._index.get(param_id)
+        
+        return None if index is None else NodeView(self, index)
+    
+    def is_node(self, param_node):
+        """Check for a node in graph. O(1).
+        
+        Args:
+            param_node (Node): Node to check.
+        
+        Returns:
+            bool: True if in graph. False if otherwise.
+        """
+        
+        return self.get_node(param_node.get_id()) == param_node
+    
+    def is_edge(self, param_edge):
+        """Check for an edge in graph. O(1) for indexed nodes, O(degree) otherwise.
+        
+        Args:
+            param_edge (Edge): Edge to check.
+            
+        Return:
+            bool: True if edge in graph. False if otherwise.
+        
+        """
+        
+        (start, end) = param_edge.get_nodes()
+        start_index, end_index = self._index.get(start.get_id()), self._index.get(end.get_id())
+        
+        # end early
+        if start_index is None or end_index is None:
+            return False
+        
+        return self._find_edge(start_index, end_index) == param_edge
+    
+    def is_directed(self):
+        """Check if the graph is directed. O(1).
+        
+        Returns:
+            bool: True if directed. False if otherwise.
+        
+        """
+        
+        return self._directed
+    
+    def vertices(self):
+        """Get all vertices for traversals. O(V).
+        
+        Returns:
+            list: Graph nodes as NodeViews.
+        
+        """
+        
+        return self.get_nodes()
+    
+    def neighbors(self, param_node):
+        """Get the nodes a node has edges to. O(1).
+        
+        Args:
+            param_node (NodeView): Node whose neighbors to find.
+        
+        Returns:
+            generator: Neighbor nodes as NodeViews.
+        
+        """
+        
+        return (node for (node, _) in self.weighted_neighbors(param_node))
+    
+    def weighted_neighbors(self, param_node):
+        """Get the nodes a node has edges to, with the edge weights. O(1).
+        
+        Args:
+            param_node (NodeView): Node whose neighbors to find.
+        
+        Returns:
+            generator: (NodeView, weight) pairs. Weight is None if unset.
+        
+        """
+        
+        index = self._index[param_node.get_id()]
+        for edge_index in self._adjacency[index]:
+            start, end = self._edge_starts[edge_index], self._edge_ends[edge_index]
+            weight = self._edge_weights[edge_index]
+            yield (NodeView(self, end if start == index else start), None if isnan(weight) else weight)
     
-    def __init__(self, param_id, param_data = None):
-        """Make a node. O(1).
+    def weighted_predecessors(self, param_node):
+        """Get the nodes with edges to a node, with the edge weights. O(1).
+        
+        Same as weighted_neighbors for an undirected graph.
         
         Args:
-            param_id (int): Id of new node.
-            param_data (int): Data of new node.
-
+            param_node (NodeView): Node whose predecessors to find.
+        
+        Returns:
+            generator: (NodeView, weight) pairs. Weight is None if unset.
+        
         """
         
-        self._data = param_data
-        self._id = param_id
+        index = self._index[param_node.get_id()]
+        for edge_index in self._reverse_adjacency[index]:
+            start, end = self._edge_starts[edge_index], self._edge_ends[edge_index]
+            weight = self._edge_weights[edge_index]
+            yield (NodeView(self, start if end == index else end), None if isnan(weight) else weight)
     
-    def __eq__(self, other):
-        """For == comparison. O(1).
+    def freeze(self):
+        """Make an immutable CSR snapshot of the graph. O(V + E).
         
         Returns:
-            bool: True if equal. False if otherwise.
-            
+            FrozenGraph: Snapshot with nodes numbered as stored.
+        
         """
         
-        #debug
-        print "Node: __eq__"
+        indptr = array("q", [0])
+        indices = array("q")
+        weights = array("d")
+        for (index, edge_indices) in enumerate(self._adjacency):
+            for edge_index in edge_indices:
+                start, end = self._edge_starts[edge_index], self._edge_ends[edge_index]
+                indices.append(end if start == index else start)
+                weights.append(self._edge_weights[edge_index])
+            indptr.append(len(indices))
+        
+        return FrozenGraph(array("q", self._ids), indptr, indices, 
+                           _optional_weights(weights), self._directed)
+    
+    def save(self, param_path):
+        """Save the graph in FrozenGraph's binary format. O(V + E).
         
-        return (self._data == other._data and self._id == other._id)
+        Node data isn't saved.
         
-    def __ne__(self, other):
-        """For != comparison. O(1).
+        Args:
+            param_path (str): Path of the file.
         
-        Returns:
-            bool: True if inequal. False if otherwise.
-            
         """
         
-        return not (self.__eq__)
-            
-    def get_data(self):
-        """Get a node's data. O(1).
+        self.freeze().save(param_path)
+    
+    def is_cyclic(self):
+        """Check if the graph is cyclic. O(V + E).
+        
+        Uses iterative DFS, so long paths can't hit the recursion limit.
         
         Returns:
-            int: Data in node.
-            
+            bool: True if cyclic. False if otherwise.
         """
         
-        return self._data
-        
+        return _find_cycle(self) is not None
     
-    def get_id(self):
-        """Get a node's id. O(1).
+    def find_cycle(self):
+        """Find a cycle in the graph. O(V + E).
         
+        Returns:
+            list: Cycle's vertices in path order. None if acyclic.
         """
         
-        return self._id
-        
-    def set_data(self, param_data):
-        """Set a node's data. O(1).
+        return _find_cycle(self)
+    
+    def topological_order(self):
+        """Order a directed graph's vertices so every edge points forward. O(V + E).
         
-        Args:
-            param_data (int): New node data.
-            
+        Returns:
+            dict: {"order": vertex list, None if cyclic, 
+                   "cycle": vertex list witnessing why no order exists, None if acyclic}
         """
         
-        self._data = param_data
+        return _topological_order(self)
+    
+    def print_nodes(self):
+        """Print all nodes. O(V).
         
-    def set_id(self, param_id):
-        """Set a node's id. O(1).
+        """
+        
+        print("~~~Nodes~~~")
+        for (node_id, data) in zip(self._ids, self._data):
+            print("Node id: {}".format(node_id))
+            print("  data: {}".format(data))
+    
+    def print_edges(self):
+        """Print all edges. O(V + E).
         
-        Args:
-            param_id (int): New node id.
-            
         """
         
-        self._id = param_id
-
-class Edge:
-    """A graph edge.
+        print("~~~Edges~~~")
+        for node in self.get_nodes():
+            print("start Node id: {}".format(node.get_id()))
+            for edge in self.get_edges(node):
+                print("  end Node id: {}".format(edge.get_nodes()[1].get_id()))
+                
+                
+class FrozenGraph:
+    """An immutable graph in compressed sparse row (CSR) form.
+    
+    Nodes are numbered 0 to V - 1. The neighbors of node i are indices[indptr[i]:indptr[i + 1]], 
+    with matching edge weights at the same positions, so traversals read flat arrays in order. 
+    Undirected edges are listed from both ends. The arrays pickle as raw bytes, making snapshots 
+    cheap to send to other processes.
     
     """
     
-    def __init__(self, param_start, param_end, param_weight = None):
-        """Make an edge. O(1).
+    def __init__(self, param_ids, param_indptr, param_indices, param_weights = None, param_directed = False):
+        """Make a snapshot from CSR arrays. O(1).
         
         Args:
-            param_start (Node): Starting node of new Edge.
-            param_end (Node): Ending node of new Edge.
-            param_weight (int): Edge weight of new Edge.
-        
+            param_ids (array): Node id of each node index.
+            param_indptr (array): Offsets of each node's neighbors in param_indices, V + 1 long.
+            param_indices (array): Neighbor node indices.
+            param_weights (array): Edge weights matching param_indices, NaN if unset. None if no edge is weighted.
+            param_directed (bool): Is graph directed.
+
         """
         
-        self._weight = param_weight
-        self._nodes = (param_start, param_end)
-
-    def __eq__(self, other):
-        """For == comparison. O(1).
+        self._ids = param_ids
+        self._indptr = param_indptr
+        self._indices = param_indices
+        self._weights = param_weights
+        self._directed = param_directed
+        # node id -> node index, the reversed graph, and the reachability index, built on first use
+        self._index = None
+        self._transpose = None
+        self._reachability = None
+    
+    @classmethod
+    def from_edge_list(cls, param_path, param_format = "csv", param_directed = False):
+        """Load a graph from an edge list file without making per-edge objects. O(V + E).
+        
+        CSV files hold "start id,end id[,weight]" lines. Binary files hold packed little-endian 
+        (int64 start id, int64 end id, float64 weight) records with NaN for unset weights, and are 
+        memory mapped. NumPy numbers, dedupes, and sorts the id columns into CSR arrays in bulk, 
+        viewing binary columns straight out of the mapping; without NumPy, edges are read in chunks 
+        and counting sorted in plain Python. Nodes are numbered in ascending id order and neighbors 
+        listed in ascending index order, and as with Graph.add_edge only the first edge from one 
+        node to another is kept.
+        
+        Args:
+            param_path (str): Path of the file.
+            param_format (str): "csv" or "bin".
+            param_directed (bool): Is graph directed.
         
         Returns:
-            bool: True if equal. False if otherwise.
-            
+            FrozenGraph: Loaded graph.
+        
         """
         
-        #debug
-        print "Edge: =="
+        if np is not None and param_format == "bin":
+            # view the columns straight out of the mapped file
+            size = os.path.getsize(param_path)
+            if size % _EDGE_RECORD_SIZE != 0:
+                raise ValueError("binary edge list size isn't a multiple of {} bytes".format(_EDGE_RECORD_SIZE))
+            if size == 0:
+                records = np.zeros(0, dtype=_EDGE_RECORD_DTYPE)
+            else:
+                records = np.memmap(param_path, dtype=_EDGE_RECORD_DTYPE, mode="r")
+            return cls(*_edge_list_csr(records["start"], records["end"], records["weight"], param_directed), param_directed)
+        
+        chunks = list(_read_edge_list(param_path, param_format))
+        if np is not None:
+            columns = [np.concatenate([np.frombuffer(chunk[i], dtype=dtype) for chunk in chunks] or [np.empty(0, dtype)]) 
+                       for (i, dtype) in enumerate((np.int64, np.int64, np.float64))]
+            return cls(*_edge_list_csr(*columns, param_directed), param_directed)
+        
+        # number the ids in ascending order
+        ids = array("q", sorted(set().union(*(chunk[0] for chunk in chunks), *(chunk[1] for chunk in chunks))))
+        index = {node_id: i for (i, node_id) in enumerate(ids)}
+        (starts, ends, weights) = (array("q"), array("q"), array("d"))
+        for (chunk_starts, chunk_ends, chunk_weights) in chunks:
+            starts.extend(map(index.__getitem__, chunk_starts))
+            ends.extend(map(index.__getitem__, chunk_ends))
+            weights.extend(chunk_weights)
+        
+        # list undirected edges from both ends, each right after the other, so the first of 
+        # repeated edges wins on both sides
+        if not param_directed:
+            count = len(starts)
+            (both_starts, both_ends, both_weights) = (array("q", bytes(16 * count)), array("q", bytes(16 * count)), 
+                                                      array("d", bytes(16 * count)))
+            (both_starts[0::2], both_starts[1::2]) = (starts, ends)
+            (both_ends[0::2], both_ends[1::2]) = (ends, starts)
+            (both_weights[0::2], both_weights[1::2]) = (weights, weights)
+            (starts, ends, weights) = (both_starts, both_ends, both_weights)
+        
+        # count edges per start node, then place each edge at its start node's next free slot
+        node_count, edge_count = len(ids), len(starts)
+        indptr = array("q", bytes(8 * (node_count + 1)))
+        for start in starts:
+            indptr[start + 1] += 1
+        for i in range(node_count):
+            indptr[i + 1] += indptr[i]
+        
+        free = array("q", indptr)
+        (indices, sorted_weights) = (array("q", bytes(8 * edge_count)), array("d", bytes(8 * edge_count)))
+        for (start, end, weight) in zip(starts, ends, weights):
+            position = free[start]
+            indices[position] = end
+            sorted_weights[position] = weight
+            free[start] = position + 1
+        
+        (indptr, indices, sorted_weights) = _dedupe_rows(indptr, indices, sorted_weights)
+        
+        return cls(ids, indptr, indices, _optional_weights(sorted_weights), param_directed)
+    
+    @classmethod
+    def load(cls, param_path, param_mmap = True):
+        """Load a graph saved by save. O(1) if memory mapped, O(V + E) otherwise.
         
-        return (self._weight == other._weight and 
-                self._nodes[0] == other._nodes[0] and
-                self._nodes[1] == other._nodes[1])
-
-    def __ne__(self, other):
-        """For != comparison. O(1).
+        Memory mapped arrays are read-only memoryviews over the file, so nothing is parsed or 
+        copied up front and processes loading the same file share its pages in the OS page cache. 
+        Big-endian machines always copy, since the file is little-endian.
+        
+        Args:
+            param_path (str): Path of the file.
+            param_mmap (bool): Memory map the arrays instead of reading them into memory.
         
         Returns:
-            bool: True if inequal. False if otherwise.
-            
+            FrozenGraph: Loaded graph.
+        
         """
         
-        #debug
-        print "Edge: !="
+        with open(param_path, "rb") as file:
+            (magic, version, flags, node_count, edge_count) = _GRAPH_FILE_HEADER.unpack(
+                file.read(_GRAPH_FILE_HEADER.size).ljust(_GRAPH_FILE_HEADER.size, b"\0"))
+            if magic != _GRAPH_FILE_MAGIC:
+                raise ValueError("not a saved graph: {}".format(param_path))
+            if version != _GRAPH_FILE_VERSION:
+                raise ValueError("unsupported saved graph version: {}".format(version))
+            
+            # typecode and length of ids, indptr, indices, and weights, in file order
+            layout = [("q", node_count), ("q", node_count + 1), ("q", edge_count)]
+            if flags & _GRAPH_FILE_WEIGHTED:
+                layout.append(("d", edge_count))
+            size = _GRAPH_FILE_HEADER.size + 8 * sum(length for (_, length) in layout)
+            if os.fstat(file.fileno()).st_size != size:
+                raise ValueError("saved graph has the wrong size: {}".format(param_path))
+            
+            arrays = list()
+            if param_mmap and sys.byteorder == "little":
+                # the views keep the mapping alive, and it is unmapped once they are all gone
+                view = memoryview(mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ))
+                offset = _GRAPH_FILE_HEADER.size
+                for (typecode, length) in layout:
+                    arrays.append(view[offset:offset + 8 * length].cast(typecode))
+                    offset += 8 * length
+            else:
+                for (typecode, length) in layout:
+                    column = array(typecode)
+                    column.fromfile(file, length)
+                    if sys.byteorder == "big":
+                        column.byteswap()
+                    arrays.append(column)
+        
+        if len(arrays) == 3:
+            arrays.append(None)
+        (ids, indptr, indices, weights) = arrays
+        
+        return cls(ids, indptr, indices, weights, bool(flags & _GRAPH_FILE_DIRECTED))
+    
+    def save(self, param_path):
+        """Save the graph in a versioned binary format. O(V + E).
+        
+        The file is a header (magic, version, flags, node count, edge count) followed by the node 
+        ids, indptr, indices, and weights if any, all little-endian and 8-byte aligned.
         
-        return not self.__eq__(other)
-                    
-    def get_nodes(self):
-        """Get an edge's nodes. O(1).
+        Args:
+            param_path (str): Path of the file.
         
         """
         
-        return self._nodes
+        flags = (_GRAPH_FILE_DIRECTED if self._directed else 0) | (_GRAPH_FILE_WEIGHTED if self._weights is not None else 0)
+        with open(param_path, "wb") as file:
+            file.write(_GRAPH_FILE_HEADER.pack(_GRAPH_FILE_MAGIC, _GRAPH_FILE_VERSION, flags, 
+                                               len(self._ids), len(self._indices)))
+            for column in (self._ids, self._indptr, self._indices, self._weights):
+                if column is None:
+                    continue
+                if sys.byteorder == "big":
+                    column = array(column.format if isinstance(column, memoryview) else column.typecode, column)
+                    column.byteswap()
+                file.write(column)
     
-    def get_weight(self):
-        """Get an edge's weight. O(1).
+    def __getstate__(self):
+        """For pickling, leaving out the rebuildable id index, reversed graph, and reachability index. O(1).
         
         """
         
-        return self._weight
+        state = self.__dict__.copy()
+        state["_index"] = None
+        state["_transpose"] = None
+        state["_reachability"] = None
+        # memory mapped arrays can't be pickled, so send copies
+        for key in ("_ids", "_indptr", "_indices", "_weights"):
+            if isinstance(state[key], memoryview):
+                state[key] = array(state[key].format, state[key].tobytes())
+        
+        return state
     
-    def set_edge(self, new_edge):
-        """Set an edge's nodes. O(1).
+    def is_directed(self):
+        """Check if the graph is directed. O(1).
+        
+        Returns:
+            bool: True if directed. False if otherwise.
         
         """
         
-        self._nodes = new_edge
+        return self._directed
+    
+    def transpose(self):
+        """Get the graph with every edge reversed. O(V + E) on first call, then O(1).
         
-    def set_weight(self, new_weight):
-        """Set an edge's weight. O(1).
+        Returns:
+            FrozenGraph: Reversed graph, the graph itself if undirected.
         
         """
         
-        self._weight = new_weight
+        if not self._directed:
+            return self
+        
+        if self._transpose is None:
+            node_count, edge_count = len(self._ids), len(self._indices)
+            
+            # count incoming edges per node, then place each edge at its end node's next free slot
+            indptr = array("q", bytes(8 * (node_count + 1)))
+            for index in self._indices:
+                indptr[index + 1] += 1
+            for i in range(node_count):
+                indptr[i + 1] += indptr[i]
+            
+            free = array("q", indptr)
+            indices = array("q", bytes(8 * edge_count))
+            weights = None if self._weights is None else array("d", bytes(8 * edge_count))
+            for start in range(node_count):
+                for position in range(self._indptr[start], self._indptr[start + 1]):
+                    end = self._indices[position]
+                    indices[free[end]] = start
+                    if weights is not None:
+                        weights[free[end]] = self._weights[position]
+                    free[end] += 1
+            
+            self._transpose = FrozenGraph(self._ids, indptr, indices, weights, True)
+            self._transpose._transpose = self
+        
+        return self._transpose
     
-    def flip(self):
-        """Reverse an edge.
+    def weighted_predecessors(self, param_index):
+        """Get the nodes with edges to a node, with the edge weights. O(1), after transpose().
+        
+        Same as weighted_neighbors for an undirected graph.
+        
+        Args:
+            param_index (int): Node index.
         
         Returns:
-            Edge: Copy of reversed edge.
+            iterator: (node index, weight) pairs. Weight is None if unset.
+        
         """
         
-        # does this work? Check special functions
-        new_edge = deepcopy(self)
-        new_edge.set_edge((self._nodes[1], self._nodes[0]))
+        return self.transpose().weighted_neighbors(param_index)
+    
+    def is_cyclic(self):
+        """Check if the graph is cyclic. O(V + E).
         
-        return new_edge
+        Uses iterative DFS, so long paths can't hit the recursion limit.
         
-class Graph:
-    """A graph of Nodes and Edges.
-    
-    """
+        Returns:
+            bool: True if cyclic. False if otherwise.
+        """
+        
+        return _find_cycle(self) is not None
     
+    def find_cycle(self):
+        """Find a cycle in the graph. O(V + E).
+        
+        Returns:
+            list: Cycle's vertices in path order. None if acyclic.
+        """
+        
+        return _find_cycle(self)
     
-    def __init__(self, param_directed = False):
-        """Make an empty graph. O(1).
+    def topological_order(self):
+        """Order a directed graph's vertices so every edge points forward. O(V + E).
         
-        Args:
-            param_directed (bool): Is graph directed.
-
+        Returns:
+            dict: {"order": vertex list, None if cyclic, 
+                   "cycle": vertex list witnessing why no order exists, None if acyclic}
         """
         
-        self._nodes = list()
-        self._edges = list()
-        self._directed = param_directed
+        return _topological_order(self)
+    
+    def reachable(self, param_start, param_end):
+        """Check if there is a path from one node to another. O(C / 64) once the index is built.
         
-    def add_node(self, param_node):
-        """Add a node if its id is unique to the graph's current nodes. O(V).
+        The reachability index is built on first use, in O(V + E * C / 64) for C strongly 
+        connected components, and kept in about C^2 / 4 bytes. That is too much for large DAGs, 
+        whose nodes are all separate components; use searching.breadth_first_search there.
         
         Args:
-            param_node (Node): Node to add.
+            param_start (int): Start node index.
+            param_end (int): End node index.
         
         Returns:
-            bool: True if added. False if otherwise.
+            bool: True if reachable, including from a node to itself. False if otherwise.
+        
         """
         
-        # check presence in nodes list
-        for node in self._nodes:
-            if node.get_id() == param_node.get_id():
-                return False
+        if self._reachability is None:
+            self._reachability = _ReachabilityIndex(self)
         
-        # add to nodes list and edges list
-        # absense in nodes list implies absense in edges list
-        self._nodes.append(param_node)
-        self._edges.append((param_node, list()))
-        return True
-                        
-    def add_edge(self, param_edge):
-        """Add an edge if it is unique to the graph's current edges.
+        return self._reachability.reaches(param_start, param_end)
+    
+    def get_arrays(self):
+        """Get the CSR arrays. O(1).
         
-        Args:
-            param_edge (Edge): Edge to add.
-            
         Returns:
-            bool: True if added. False if otherwise.
-            
-        """
+            tuple: indptr, indices, and weights (None if no edge is weighted).
         
-        # all edges to add
-        edges_to_add = [param_edge]
-        # account for undirected graph
-        if not self._directed:
-            edges_to_add.append(param_edge.flip())
-            
-        # add nodes if not in nodes container
-        self.add_node(param_edge.get_nodes()[0])
-        #debug
-        print "add second"
-        self.add_node(param_edge.get_nodes()[1])
+        """
         
-        #debug
-        print "check edges"
+        return (self._indptr, self._indices, self._weights)
+    
+    def node_count(self):
+        """Get the number of nodes. O(1).
         
-        # add edge if not in edges container
-        for (node, edges) in self._edges:
-            for edge_to_add in edges_to_add:
-                if node == edge_to_add.get_nodes()[0] and edge_to_add not in edges:
-                    edges.append(edge_to_add)
-
-        return False
-       
-    def get_nodes(self):
-        """Get all nodes. O(1).
+        """
         
-        Returns:
-            list: Graph nodes.
+        return len(self._ids)
+    
+    def edge_count(self):
+        """Get the number of stored edges, counting undirected edges twice. O(1).
         
         """
         
-        return self._nodes
-            
-    def get_edges(self, param_node):
-        """Get a node's edges. O(V).
+        return len(self._indices)
+    
+    def get_ids(self):
+        """Get the node ids. O(1).
         
-        Args:
-            param_node (Node): Node whose edges to find.
-            
         Returns:
-            list: Edges. None if otherwise.
-            
+            array: Node id of each node index.
+        
         """
         
-        for (node, edges) in self._edges:
-            if node == param_node:
-                return edges
-        else:
-            return None
-                        
-    def get_node(self, param_id):
-        """Get a node by id. O(V).
+        return self._ids
+    
+    def get_id(self, param_index):
+        """Get a node's id. O(1).
         
         Args:
-            param_id (int): Node id to search.
-            
+            param_index (int): Node index.
+        
         Returns:
-            Node: Node with matching id. None if otherwise.
-            
+            int: Node id.
+        
         """
         
-        for node in self._nodes:
-            if node.get_id() == param_id:
-                return node
-        else:
-            return None
-
-    def is_node(self, param_node):
-        """Check for a node in graph.
+        return self._ids[param_index]
+    
+    def get_index(self, param_id):
+        """Get a node's index. O(1), after an O(V) index build on first call.
         
         Args:
-            param_node (Node): Node to check.
+            param_id (int): Node id.
         
         Returns:
-            bool: True if in graph. False if otherwise.
+            int: Node index. None if otherwise.
+        
         """
         
-        for node in self._nodes:
-            if node == param_node:
-                return True
-                
-        return False
+        if self._index is None:
+            self._index = {node_id: i for (i, node_id) in enumerate(self._ids)}
         
-    def is_edge(self, param_edge):
-        """Check for an edge in graph.
+        return self._index.get(param_id)
+    
+    def vertices(self):
+        """Get all vertices for traversals. O(1).
         
-        Args:
-            param_edge (Edge): Edge to check.
-            
-        Return:
-            bool: True if edge in graph. False if otherwise.
+        Returns:
+            range: Node indices.
         
         """
         
-        # possible edges
-        edges_to_check = self.get_edges(param_edge.get_nodes()[0])
+        return range(len(self._ids))
+    
+    def neighbors(self, param_index):
+        """Get the nodes a node has edges to. O(degree).
         
-        # end early
-        if edges_to_check is None or len(edges_to_check) == 0:
-            return False
+        Args:
+            param_index (int): Node index.
         
-        # check edges
-        if param_edge in edges_to_check:
-            return True
-        else:
-            return False
-             
-    def is_cyclic(self):
-        """Check if the graph is cyclic. O(V + E)
+        Returns:
+            array: Neighbor node indices.
         
-        What technique is this?
         """
         
-        # nodes where a search has started from
-        starting_nodes = []
-        
-        def find_cycle(start, ignore = None):
-            """Recursively, find a cycle in a graph starting from a node.
-            
-            Args:
-                start (Node): Starting node.
-                ignore (Node): Node neighbor to ignore in an undirected graph.
-                
-            """
-            
-            # already performed recursive search starting here
-            if start in starting_nodes:
-                return False
-            
-            starting_nodes.append(start)
-            for edge in self.get_edges(start):
-                neighbor_node = edge.get_nodes()[1]
-                # found cycle in a directed graph
-                if self._directed and (neighbor_node in starting_nodes or find_cycle(neighbor_node)):
-                    return True
-                elif not self._directed:
-                    # found candidate for cycle in an undirected graph
-                    if (neighbor_node in starting_nodes):
-                        # also is not backtracking in the path so far
-                        if neighbor_node is not ignore:
-                            return True
-                    # found cycle later down the path
-                    elif find_cycle(neighbor_node, ignore = start):
-                        return True
-            return False
+        return self._indices[self._indptr[param_index]:self._indptr[param_index + 1]]
+    
+    def weighted_neighbors(self, param_index):
+        """Get the nodes a node has edges to, with the edge weights. O(1).
         
-        return any(find_cycle(node) for node in self._nodes)
+        Args:
+            param_index (int): Node index.
         
-    def print_nodes(self):
-        """Print all nodes. O(V).
+        Returns:
+            iterator: (node index, weight) pairs. Weight is None if unset.
         
         """
         
-        print "~~~Nodes~~~"
-        for node in self._nodes:
-            print "Node id: {}".format(node.get_id())
-            print "  data: {}".format(node.get_data())
-
-    def print_edges(self):
-        """Print all edges. O(V + E).
-        
-        """
+        start, end = self._indptr[param_index], self._indptr[param_index + 1]
+        if self._weights is None:
+            return ((index, None) for index in self._indices[start:end])
         
-        print "~~~Edges~~~"
-        for (node, edges) in self._edges:
-            print "start Node id: {}".format(node.get_id())
-            for edge in edges:
-                print "  end Node id: {}".format(edge.get_nodes()[1].get_id())
-                
-                
+        return ((index, None if isnan(weight) else weight) 
+                for (index, weight) in zip(self._indices[start:end], self._weights[start:end]))
+    
 # test
 if __name__ == "__main__":
     # make graph
@@ -419,11 +2818,10 @@ if __name__ == "__main__":
     node2 = Node(2, 15)
     edge12_1 = Edge(node1, node2)
     edge12_2 = Edge(node1, node2)
-    print id(edge12_1)
-    print id(edge12_2)
-    graph1.add_edge(edge12)
-    print "wut"
-    print graph1.is_edge(edge12_1)
-    print graph1.is_edge(edge12_2)
+    print(id(edge12_1))
+    print(id(edge12_2))
+    graph1.add_edge(edge12_1)
+    print(graph1.is_edge(edge12_1))
+    print(graph1.is_edge(edge12_2))
     
     
\ No newline at end of file
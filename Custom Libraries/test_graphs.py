@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+
+"""Tests for graphs.py.
+
+Run from this directory:
+    python -m unittest test_graphs
+
+"""
+
+import random
+import threading
+import unittest
+
+from graphs import Edge, Graph, Node, _ChunkedDict
+
+def _graph_state(param_graph):
+    """Read a graph into plain dicts.
+    
+    Args:
+        param_graph (Graph): Graph to read.
+    
+    Returns:
+        tuple: node id -> (neighbor id -> weight), and the same for predecessors if directed,
+            None otherwise.
+    
+    """
+    
+    successors = {node.get_id(): {neighbor.get_id(): weight for (neighbor, weight) in param_graph.weighted_neighbors(node)}
+                  for node in param_graph.get_nodes()}
+    if not param_graph.is_directed():
+        return (successors, None)
+    predecessors = {node.get_id(): {neighbor.get_id(): weight for (neighbor, weight) in param_graph.weighted_predecessors(node)}
+                    for node in param_graph.get_nodes()}
+    
+    return (successors, predecessors)
+
+class SnapshotTest(unittest.TestCase):
+
+    def check_random_writes(self, param_directed):
+        rng = random.Random(1)
+        graph = Graph(param_directed = param_directed)
+        # reference maps, kept the same way as _graph_state reads the graph
+        (successors, predecessors) = (dict(), dict())
+        versions = list()
+        for step in range(3000):
+            (a, b) = (rng.randrange(50), rng.randrange(50))
+            operation = rng.random()
+            if operation < 0.1:
+                graph.add_node(Node(a))
+                successors.setdefault(a, dict())
+                predecessors.setdefault(a, dict())
+            elif operation < 0.6:
+                weight = rng.choice((None, rng.random()))
+                graph.add_edge(Edge(Node(a), Node(b), weight))
+                for node_id in (a, b):
+                    successors.setdefault(node_id, dict())
+                    predecessors.setdefault(node_id, dict())
+                if b not in successors[a]:
+                    successors[a][b] = weight
+                    if param_directed:
+                        predecessors[b][a] = weight
+                    else:
+                        successors[b][a] = weight
+            elif operation < 0.75:
+                graph.remove_edge(Edge(Node(a), Node(b)))
+                if a in successors and b in successors[a]:
+                    del successors[a][b]
+                    if param_directed:
+                        del predecessors[b][a]
+                    else:
+                        successors[b].pop(a, None)
+            elif operation < 0.8:
+                graph.remove_node(Node(a))
+                if a in successors:
+                    del successors[a]
+                    del predecessors[a]
+                    for neighbors in list(successors.values()) + list(predecessors.values()):
+                        neighbors.pop(a, None)
+            elif operation < 0.9:
+                weight = rng.random()
+                if graph.set_weight(Edge(Node(a), Node(b)), weight):
+                    successors[a][b] = weight
+                    if param_directed:
+                        predecessors[b][a] = weight
+                    else:
+                        successors[b][a] = weight
+            else:
+                reference = ({key: dict(value) for (key, value) in successors.items()},
+                             {key: dict(value) for (key, value) in predecessors.items()} if param_directed else None)
+                versions.append((graph.snapshot(), reference))
+            
+            self.assertEqual(_graph_state(graph), (successors, predecessors if param_directed else None))
+            if step % 100 == 0:
+                for (snapshot, reference) in versions:
+                    self.assertEqual(_graph_state(snapshot), reference)
+        
+        # writing to a snapshot forks it without touching the graph
+        (snapshot, _) = versions[-1]
+        snapshot.add_edge(Edge(Node(100), Node(101)))
+        self.assertIsNotNone(snapshot.get_node(100))
+        self.assertIsNone(graph.get_node(100))
+    
+    def test_random_writes_undirected(self):
+        self.check_random_writes(False)
+    
+    def test_random_writes_directed(self):
+        self.check_random_writes(True)
+    
+    def test_concurrent_readers(self):
+        rng = random.Random(2)
+        graph = Graph(param_directed = True)
+        stop = threading.Event()
+        failures = list()
+        
+        def read():
+            while not stop.is_set():
+                snapshot = graph.snapshot()
+                (successors, predecessors) = _graph_state(snapshot)
+                # every edge is indexed from both ends, and the version doesn't change under the reader
+                for (node_id, neighbors) in successors.items():
+                    for (neighbor_id, weight) in neighbors.items():
+                        if predecessors[neighbor_id].get(node_id, 0) != weight:
+                            failures.append((node_id, neighbor_id))
+                if _graph_state(snapshot) != (successors, predecessors):
+                    failures.append("changed")
+        
+        readers = [threading.Thread(target = read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for _ in range(20000):
+            (a, b) = (rng.randrange(500), rng.randrange(500))
+            operation = rng.random()
+            if operation < 0.6:
+                graph.add_edge(Edge(Node(a), Node(b), rng.random()))
+            elif operation < 0.8:
+                graph.remove_edge(Edge(Node(a), Node(b)))
+            elif operation < 0.9:
+                graph.set_weight(Edge(Node(a), Node(b)), rng.random())
+            else:
+                graph.remove_node(Node(a))
+        stop.set()
+        for reader in readers:
+            reader.join()
+        
+        self.assertEqual(failures, list())
+    
+    def test_chunks_spread_aligned_ids(self):
+        # ids sharing their low bits still spread over the chunks
+        chunked = _ChunkedDict((node_id * 4096, None) for node_id in range(100000))
+        self.assertLess(max(len(chunk) for chunk in chunked._chunks), 4 * len(chunked) // len(chunked._chunks))
+
+if __name__ == "__main__":
+    unittest.main()